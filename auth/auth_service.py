@@ -1,52 +1,197 @@
 import streamlit as st
-from config.database import get_db
+from config import database
+from config.database import get_db, get_escritor
+from config.monitoramento import instrumentar
+import bcrypt
 import hashlib
+import hmac
+import json
 import os
+import re
+import threading
+import time
 
+class LimitadorTentativas:
+    """Balde de fichas do processo: limita quantas verificações bcrypt podem rodar por segundo."""
+
+    def __init__(self, capacidade: int = 5, reposicao_por_s: float = 0.5):
+        self.capacidade = capacidade
+        self.reposicao_por_s = reposicao_por_s
+        self._fichas = float(capacidade)
+        self._atualizado_em = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _repor(self, agora: float):
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado_em) * self.reposicao_por_s)
+        self._atualizado_em = agora
+
+    def consumir(self) -> bool:
+        with self._lock:
+            self._repor(time.monotonic())
+            if self._fichas < 1:
+                return False
+            self._fichas -= 1
+            return True
+
+    def espera(self) -> float:
+        # Segundos até a próxima ficha (0 se já pode tentar)
+        with self._lock:
+            self._repor(time.monotonic())
+            return max(0.0, (1 - self._fichas) / self.reposicao_por_s)
+
+_limitador = LimitadorTentativas()
+
+# Segredo e geração da chave dos tokens em memória, por banco: (segredo, geração, lido em).
+# A troca de código descarta a cópia deste processo na hora; os demais processos
+# releem o banco a cada CHAVE_RELEITURA_S e passam a recusar os tokens antigos
+CHAVE_RELEITURA_S = 30.0
+_chaves = {}
+_chaves_lock = threading.Lock()
+
+def _chave_tokens():
+    with _chaves_lock:
+        agora = time.monotonic()
+        chave = _chaves.get(database.DATABASE_PATH)
+        if chave is None or agora - chave[2] >= CHAVE_RELEITURA_S:
+            with get_db() as conn:
+                row = conn.execute("SELECT segredo_tokens, geracao_chave FROM auth_config LIMIT 1").fetchone()
+            chave = _chaves[database.DATABASE_PATH] = (bytes.fromhex(row[0]), row[1], agora)
+        return chave[0], chave[1]
+
+def _descartar_chave():
+    with _chaves_lock:
+        _chaves.pop(database.DATABASE_PATH, None)
+
+def _assinar(segredo: bytes, conteudo: str) -> str:
+    return hmac.new(segredo, conteudo.encode(), hashlib.sha256).hexdigest()
+
+@instrumentar
 class AuthService:
-    @staticmethod
-    def init_auth_table():
-        with get_db() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS auth_config (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    access_code_hash TEXT NOT NULL
-                )
-            """)
-            
-            # Verifica se já existe um código de acesso
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM auth_config")
-            if cursor.fetchone()[0] == 0:
-                # Código padrão inicial: "admin123"
-                default_code_hash = hashlib.sha256("algumasenhaaqui".encode()).hexdigest()
-                conn.execute("INSERT INTO auth_config (access_code_hash) VALUES (?)", (default_code_hash,))
-            conn.commit()
+    COOKIE_TOKEN = "bolao_sessao"  # cookie que guarda o token de "Manter conectado"
+    PARAMETRO_TOKEN = "sessao"  # onde o token ficava antes, na URL; removido ao abrir a página
+    TOKEN_VALIDADE_S = 12 * 3600
+    BCRYPT_ROUNDS = 12
+    BCRYPT_MAX_BYTES = 72  # o bcrypt não aceita senhas maiores
+    # Código de administrador, separado do código de acesso compartilhado; sem ele os
+    # controles que afetam o processo inteiro ficam desativados
+    ADMIN_CODE_ENV = "BOLAO_ADMIN_CODE"
 
     @staticmethod
     def verify_access_code(code: str) -> bool:
-        # Se já estiver autenticado pelo cookie, retorna True
-        if st.session_state.get('_cookie_auth_status'):
-            return True
-            
-        code_hash = hashlib.sha256(code.encode()).hexdigest()
+        # Cada tentativa custa uma verificação bcrypt; o limitador evita que força bruta ocupe a CPU
+        if not _limitador.consumir():
+            return False
+
+        codigo = code.encode()
         with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT access_code_hash FROM auth_config LIMIT 1")
-            result = cursor.fetchone()
-            return result and result[0] == code_hash
+            result = conn.execute("SELECT id, access_code_hash FROM auth_config LIMIT 1").fetchone()
+        if not result:
+            return False
+
+        if result[1].startswith('$2'):
+            return len(codigo) <= AuthService.BCRYPT_MAX_BYTES and bcrypt.checkpw(codigo, result[1].encode())
+
+        # Hash legado (SHA-256 sem sal): confere e já regrava em bcrypt
+        if not hmac.compare_digest(result[1], hashlib.sha256(codigo).hexdigest()):
+            return False
+        if len(codigo) <= AuthService.BCRYPT_MAX_BYTES:
+            novo_hash = bcrypt.hashpw(codigo, bcrypt.gensalt(AuthService.BCRYPT_ROUNDS)).decode()
+            get_escritor().executar(lambda conn: conn.execute(
+                "UPDATE auth_config SET access_code_hash = ? WHERE id = ?", (novo_hash, result[0])
+            ))
+        return True
+
+    @staticmethod
+    def retry_after() -> float:
+        return _limitador.espera()
+
+    @staticmethod
+    def issue_token() -> str:
+        # Token "geração.expiração.assinatura", verificável só com o segredo em memória
+        segredo, geracao = _chave_tokens()
+        conteudo = f"{geracao}.{int(time.time()) + AuthService.TOKEN_VALIDADE_S}"
+        return f"{conteudo}.{_assinar(segredo, conteudo)}"
+
+    @staticmethod
+    def verify_token(token: str) -> bool:
+        # str.isdigit aceita dígitos como '²', que int() recusa: só ASCII
+        partes = token.split('.')
+        if len(partes) != 3 or not all(re.fullmatch(r'[0-9]+', parte) for parte in partes[:2]):
+            return False
+        segredo, geracao = _chave_tokens()
+        conteudo = f"{partes[0]}.{partes[1]}"
+        return (
+            int(partes[0]) == geracao
+            and int(partes[1]) > time.time()
+            and hmac.compare_digest(partes[2], _assinar(segredo, conteudo))
+        )
 
     @staticmethod
     def change_access_code(new_code: str) -> bool:
-        new_code_hash = hashlib.sha256(new_code.encode()).hexdigest()
-        with get_db() as conn:
-            conn.execute("UPDATE auth_config SET access_code_hash = ?", (new_code_hash,))
-            conn.commit()
-            # Limpa o cookie de autenticação ao mudar a senha
-            st.session_state['_cookie_auth_status'] = False
-            return True
+        codigo = new_code.encode()
+        if not codigo or len(codigo) > AuthService.BCRYPT_MAX_BYTES:
+            return False
+        new_code_hash = bcrypt.hashpw(codigo, bcrypt.gensalt(AuthService.BCRYPT_ROUNDS)).decode()
+        # Nova geração da chave: todos os tokens emitidos até aqui deixam de valer
+        get_escritor().executar(lambda conn: conn.execute(
+            "UPDATE auth_config SET access_code_hash = ?, geracao_chave = geracao_chave + 1",
+            (new_code_hash,)
+        ))
+        _descartar_chave()
+        st.session_state['_token_navegador'] = ''
+        return True
+
+    @staticmethod
+    def saved_token() -> str:
+        # Tokens na URL vazavam pelo histórico e por links compartilhados: só vale o cookie
+        st.query_params.pop(AuthService.PARAMETRO_TOKEN, None)
+        return st.context.cookies.get(AuthService.COOKIE_TOKEN, '')
+
+    @staticmethod
+    def remember():
+        st.session_state['_token_navegador'] = AuthService.issue_token()
+
+    @staticmethod
+    def sync_cookie():
+        # O Streamlit só lê cookies; a gravação é feita por um script na página. Sem
+        # gravação pendente, um cookie recebido por uma sessão não autenticada é
+        # inválido ou vencido e é apagado
+        token = st.session_state.pop('_token_navegador', None)
+        if token is None:
+            if st.session_state.get('authentication_status') or not st.context.cookies.get(AuthService.COOKIE_TOKEN):
+                return
+            token = ''
+        cookie = json.dumps(
+            f"{AuthService.COOKIE_TOKEN}={token}; Path=/; SameSite=Strict; "
+            f"Max-Age={AuthService.TOKEN_VALIDADE_S if token else 0}"
+        )
+        st.html(
+            f"<script>document.cookie = {cookie}"
+            f" + (location.protocol === 'https:' ? '; Secure' : '');</script>",
+            unsafe_allow_javascript=True
+        )
+
+    @staticmethod
+    def admin_enabled() -> bool:
+        return bool(os.environ.get(AuthService.ADMIN_CODE_ENV))
+
+    @staticmethod
+    def verify_admin_code(code: str) -> bool:
+        # Passa pelo mesmo limitador do login; o acesso vale só para a sessão atual
+        esperado = os.environ.get(AuthService.ADMIN_CODE_ENV, '')
+        if not esperado or not _limitador.consumir():
+            return False
+        if not hmac.compare_digest(code.encode(), esperado.encode()):
+            return False
+        st.session_state.admin_status = True
+        return True
+
+    @staticmethod
+    def is_admin() -> bool:
+        return AuthService.admin_enabled() and st.session_state.get('admin_status', False)
 
     @staticmethod
     def logout():
         st.session_state.authentication_status = False
-        st.session_state['_cookie_auth_status'] = False 
\ No newline at end of file
+        st.session_state.admin_status = False
+        st.session_state['_token_navegador'] = ''
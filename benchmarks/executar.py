@@ -0,0 +1,276 @@
+"""Benchmarks das operações do ParticipanteService contra um banco SQLite temporário.
+
+Uso (a partir da raiz do projeto):
+
+    python -m benchmarks.executar --tamanhos 1000,10000,100000 --salvar-baseline
+    python -m benchmarks.executar --tamanhos 1000,10000,100000 --comparar
+
+Além das operações por tamanho, importa duas vezes uma planilha CSV de
+--importacao linhas (padrão: 100 mil) num banco novo, pelo mesmo caminho da
+página de Cadastro; se passar de LIMITE_IMPORTACAO_S_POR_100K por 100 mil linhas
+importadas, a execução falha mesmo sem baseline.
+
+Cada operação é repetida e a mediana define a vazão; o pico de memória vem de
+uma execução extra sob tracemalloc, para não distorcer os tempos. Na comparação
+com o baseline, a execução falha (código 1) se alguma vazão cair ou algum pico
+de memória subir além da tolerância.
+"""
+import argparse
+import csv
+import gc
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+RAIZ_PROJETO = Path(__file__).resolve().parent.parent
+BASELINE_PADRAO = RAIZ_PROJETO / "benchmarks" / "resultados" / "baseline.json"
+TAMANHOS_PADRAO = "1000,10000,100000"
+INSERCOES_UNITARIAS = 200  # inserções individuais por medição (cada uma com commit próprio)
+TOLERANCIA_PADRAO = 0.20
+IMPORTACAO_PADRAO = 100_000
+# Teto absoluto da importação de planilha, proporcional à quantidade de linhas
+LIMITE_IMPORTACAO_S_POR_100K = 15.0
+
+from config import database
+from services.participante_service import ParticipanteService
+from benchmarks.gerador import gerar_participantes, gerar_sorteio
+
+
+def _medir(funcao, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'mediana_s': statistics.median(tempos), 'minimo_s': min(tempos), 'pico_memoria_mb': pico / 2**20}
+
+
+def _resultado(medida: dict, itens: int) -> dict:
+    return {
+        'itens_por_operacao': itens,
+        'mediana_ms': medida['mediana_s'] * 1000,
+        'minimo_ms': medida['minimo_s'] * 1000,
+        'vazao_por_s': itens / medida['mediana_s'] if medida['mediana_s'] else float('inf'),
+        'pico_memoria_mb': medida['pico_memoria_mb']
+    }
+
+
+def _usar_banco(caminho: str):
+    # Aponta o pool para o arquivo temporário; a versão dos dados recomeça, então o cache é limpo
+    database.fechar_pools()
+    database.DATABASE_PATH = caminho
+    ParticipanteService.invalidar_cache()
+    database.init_db()
+
+
+def executar_tamanho(quantidade: int, repeticoes: int, semente: int) -> dict:
+    resultados = {}
+    sorteio = gerar_sorteio(semente)
+    participantes = list(gerar_participantes(quantidade + INSERCOES_UNITARIAS, semente))
+    lote, unitarios = participantes[:quantidade], participantes[quantidade:]
+
+    with tempfile.TemporaryDirectory(prefix="bolao-bench-") as diretorio:
+        caminho_original = database.DATABASE_PATH
+        try:
+            # Inserção em lote: cada repetição grava num banco novo
+            def inserir_lote():
+                caminho = os.path.join(diretorio, f"lote-{time.perf_counter_ns()}.db")
+                _usar_banco(caminho)
+                resumo = ParticipanteService.adicionar_participantes_em_lote(lote)
+                assert resumo['inseridos'] == quantidade, resumo
+
+            resultados['adicionar_participantes_em_lote'] = _resultado(_medir(inserir_lote, repeticoes), quantidade)
+
+            # O último banco do lote fica com exatamente `quantidade` participantes
+            _usar_banco(os.path.join(diretorio, "bolao.db"))
+            ParticipanteService.adicionar_participantes_em_lote(lote)
+
+            # Inserções individuais sobre o banco já populado; removidas depois de cada medição
+            def inserir_unitarios():
+                for participante in unitarios:
+                    assert ParticipanteService.adicionar_participante(participante)
+                with database.get_db() as conn:
+                    conn.execute("DELETE FROM participantes WHERE id > ?", (quantidade,))
+                    conn.commit()
+
+            resultados['adicionar_participante'] = _resultado(_medir(inserir_unitarios, repeticoes), len(unitarios))
+
+            def listar_frio():
+                ParticipanteService.invalidar_cache()
+                assert len(ParticipanteService.listar_participantes()) == quantidade
+
+            resultados['listar_participantes'] = _resultado(_medir(listar_frio, repeticoes), quantidade)
+            resultados['listar_participantes_cache'] = _resultado(
+                _medir(ParticipanteService.listar_participantes, repeticoes), quantidade
+            )
+            resultados['carregar_em_colunas'] = _resultado(
+                _medir(ParticipanteService.carregar_em_colunas, repeticoes), quantidade
+            )
+            resultados['obter_estatisticas'] = _resultado(
+                _medir(ParticipanteService.obter_estatisticas, repeticoes), quantidade
+            )
+            resultados['analisar_numeros_repetidos'] = _resultado(
+                _medir(ParticipanteService.analisar_numeros_repetidos, repeticoes), quantidade
+            )
+            resultados['verificar_resultados'] = _resultado(
+                _medir(lambda: ParticipanteService.verificar_resultados(sorteio), repeticoes), quantidade
+            )
+            resultados['verificar_resultados_indice'] = _resultado(
+                _medir(lambda: ParticipanteService.verificar_resultados(sorteio, usar_indice=True), repeticoes),
+                quantidade
+            )
+        finally:
+            database.fechar_pools()
+            database.DATABASE_PATH = caminho_original
+            ParticipanteService.invalidar_cache()
+
+    return resultados
+
+
+def executar_importacao(quantidade: int, repeticoes: int, semente: int) -> dict:
+    from services.importacao import importar_planilha
+    
+    with tempfile.TemporaryDirectory(prefix="bolao-bench-") as diretorio:
+        planilha = os.path.join(diretorio, "apostas.csv")
+        with open(planilha, 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(['nome', 'numeros', 'status'])
+            for participante in gerar_participantes(quantidade, semente):
+                escritor.writerow([
+                    participante.nome,
+                    ' '.join(f"{numero:02d}" for numero in participante.numeros_escolhidos),
+                    participante.status_pagamento
+                ])
+        
+        caminho_original = database.DATABASE_PATH
+        try:
+            # Cada repetição importa a planilha duas vezes num banco novo: a segunda carga
+            # cai sobre uma tabela já populada, onde o custo por bloco costuma crescer
+            def importar():
+                _usar_banco(os.path.join(diretorio, f"importacao-{time.perf_counter_ns()}.db"))
+                for _ in range(2):
+                    with open(planilha, 'rb') as arquivo:
+                        resumo = importar_planilha(arquivo, planilha)
+                    assert resumo['inseridos'] == quantidade, resumo
+            
+            return {'importar_planilha': _resultado(_medir(importar, repeticoes), 2 * quantidade)}
+        finally:
+            database.fechar_pools()
+            database.DATABASE_PATH = caminho_original
+            ParticipanteService.invalidar_cache()
+
+
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> list:
+    regressoes = []
+    for tamanho, operacoes in atual['resultados'].items():
+        for operacao, medida in operacoes.items():
+            referencia = baseline.get('resultados', {}).get(tamanho, {}).get(operacao)
+            if not referencia:
+                continue
+            if medida['vazao_por_s'] < referencia['vazao_por_s'] * (1 - tolerancia):
+                regressoes.append({
+                    'tamanho': tamanho, 'operacao': operacao, 'metrica': 'vazao_por_s',
+                    'baseline': referencia['vazao_por_s'], 'atual': medida['vazao_por_s']
+                })
+            # Picos abaixo de 1 MB oscilam demais para comparar proporcionalmente
+            limite_memoria = max(referencia['pico_memoria_mb'] * (1 + tolerancia), referencia['pico_memoria_mb'] + 1)
+            if medida['pico_memoria_mb'] > limite_memoria:
+                regressoes.append({
+                    'tamanho': tamanho, 'operacao': operacao, 'metrica': 'pico_memoria_mb',
+                    'baseline': referencia['pico_memoria_mb'], 'atual': medida['pico_memoria_mb']
+                })
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks das operações do bolão sobre dados sintéticos")
+    parser.add_argument('--tamanhos', default=TAMANHOS_PADRAO,
+                        help="Quantidades de participantes separadas por vírgula (ex.: 1000,10000,1000000)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PADRAO)
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava esta execução como baseline")
+    parser.add_argument('--comparar', action='store_true', help="Compara esta execução com o baseline")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                        help="Variação relativa aceita antes de acusar regressão (padrão: 0.20)")
+    parser.add_argument('--importacao', type=int, default=IMPORTACAO_PADRAO,
+                        help="Linhas da planilha importada (0 desativa; padrão: 100000)")
+    parser.add_argument('--saida', type=Path, help="Grava o resultado desta execução neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    tamanhos = [int(t) for t in args.tamanhos.split(',') if t.strip()]
+
+    atual = {
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': platform.platform(),
+            'semente': args.semente,
+            'repeticoes': args.repeticoes
+        },
+        'resultados': {}
+    }
+    for quantidade in tamanhos:
+        atual['resultados'][str(quantidade)] = executar_tamanho(quantidade, args.repeticoes, args.semente)
+        for operacao, medida in atual['resultados'][str(quantidade)].items():
+            print(f"{quantidade:>9} {operacao:<32} {medida['mediana_ms']:>10.1f} ms "
+                  f"{medida['vazao_por_s']:>14,.0f}/s {medida['pico_memoria_mb']:>8.1f} MB")
+
+    codigo = 0
+    if args.importacao:
+        medida = executar_importacao(args.importacao, args.repeticoes, args.semente)['importar_planilha']
+        atual['resultados'].setdefault(str(args.importacao), {})['importar_planilha'] = medida
+        print(f"{args.importacao:>9} {'importar_planilha (2x)':<32} {medida['mediana_ms']:>10.1f} ms "
+              f"{medida['vazao_por_s']:>14,.0f}/s {medida['pico_memoria_mb']:>8.1f} MB")
+        limite_s = LIMITE_IMPORTACAO_S_POR_100K * medida['itens_por_operacao'] / 100_000
+        if medida['mediana_ms'] / 1000 > limite_s:
+            print(f"REGRESSÃO {args.importacao} importar_planilha mediana_s: "
+                  f"limite {limite_s:.2f} -> {medida['mediana_ms'] / 1000:.2f}")
+            codigo = 1
+
+    if args.saida:
+        args.saida.parent.mkdir(parents=True, exist_ok=True)
+        args.saida.write_text(json.dumps(atual, indent=2, ensure_ascii=False))
+
+    if args.comparar:
+        if not args.baseline.exists():
+            print(f"Baseline não encontrado em {args.baseline}")
+            return 2
+        regressoes = comparar(atual, json.loads(args.baseline.read_text()), args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao['tamanho']} {regressao['operacao']} {regressao['metrica']}: "
+                  f"{regressao['baseline']:.2f} -> {regressao['atual']:.2f}")
+        if not regressoes:
+            print("Nenhuma regressão em relação ao baseline")
+        codigo = 1 if regressoes else codigo
+
+    if args.salvar_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(atual, indent=2, ensure_ascii=False))
+        print(f"Baseline gravado em {args.baseline}")
+
+    return codigo
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+from typing import Iterator, List
+import numpy as np
+from models.participante import Participante
+
+# Datas de aniversário puxam as escolhas para 1..31; o resto do volante é menos escolhido
+PESO_DATAS = 1.6
+# Proporção de apostas por quantidade de números (6 = aposta simples)
+DISTRIBUICAO_TAMANHOS = {6: 0.90, 7: 0.05, 8: 0.025, 9: 0.01, 10: 0.006, 12: 0.005, 15: 0.004}
+DISTRIBUICAO_STATUS = {"Pendente": 0.30, "Pago": 0.40, "Confirmado": 0.30}
+
+PRIMEIROS_NOMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Hugo", "Isabela", "João",
+    "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Tiago", "Vitória", "Wagner"
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Cardoso", "Rocha", "Dias"
+)
+
+def _pesos_numeros() -> np.ndarray:
+    pesos = np.ones(60)
+    pesos[:31] = PESO_DATAS
+    return pesos / pesos.sum()
+
+def gerar_apostas(quantidade: int, semente: int = 42, bloco: int = 100_000) -> Iterator[List[int]]:
+    # Amostragem ponderada sem reposição vetorizada (Gumbel top-k), em blocos para limitar memória
+    rng = np.random.default_rng(semente)
+    log_pesos = np.log(_pesos_numeros()).astype(np.float32)
+    tamanhos_possiveis = np.array(list(DISTRIBUICAO_TAMANHOS))
+    probabilidades = np.array(list(DISTRIBUICAO_TAMANHOS.values()))
+    probabilidades = probabilidades / probabilidades.sum()
+    
+    for inicio in range(0, quantidade, bloco):
+        n = min(bloco, quantidade - inicio)
+        tamanhos = rng.choice(tamanhos_possiveis, size=n, p=probabilidades)
+        chaves = log_pesos + rng.gumbel(size=(n, 60)).astype(np.float32)
+        # Ordena decrescente: os k primeiros índices de cada linha são a aposta de tamanho k
+        ordem = np.argsort(-chaves, axis=1)[:, :tamanhos_possiveis.max()] + 1
+        for linha, tamanho in zip(ordem, tamanhos):
+            yield sorted(linha[:tamanho].tolist())
+
+def gerar_participantes(quantidade: int, semente: int = 42) -> Iterator[Participante]:
+    rng = np.random.default_rng(semente + 1)
+    status = rng.choice(list(DISTRIBUICAO_STATUS), size=quantidade, p=list(DISTRIBUICAO_STATUS.values()))
+    primeiros = rng.integers(len(PRIMEIROS_NOMES), size=quantidade)
+    sobrenomes = rng.integers(len(SOBRENOMES), size=quantidade)
+    for indice, numeros in enumerate(gerar_apostas(quantidade, semente)):
+        yield Participante(
+            nome=f"{PRIMEIROS_NOMES[primeiros[indice]]} {SOBRENOMES[sobrenomes[indice]]} {indice}",
+            valor_pago=35.0,
+            numeros_escolhidos=numeros,
+            status_pagamento=str(status[indice]),
+            data_pagamento=f"2024-{1 + indice % 12:02d}-{1 + indice % 28:02d} 12:00:00"
+        )
+
+def gerar_sorteio(semente: int = 7) -> List[int]:
+    # O sorteio oficial é uniforme
+    return sorted((np.random.default_rng(semente).choice(60, size=6, replace=False) + 1).tolist())
@@ -1,21 +1,530 @@
 import sqlite3
 from contextlib import contextmanager
+import hashlib
+import logging
 import os
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+from models.participante import numeros_para_bitmask
+from config.monitoramento import registrar_latencia
+
+logger = logging.getLogger(__name__)
 
 DATABASE_PATH = "database/bolao.db"
+ESQUEMA_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "schema.sql")
+
+# Configuração do pool de conexões
+POOL_TAMANHO = 8
+POOL_TIMEOUT = 10.0  # segundos esperando uma conexão livre
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",  # ~16 MB por conexão
+    "PRAGMA mmap_size = 134217728",  # 128 MB
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+)
+
+# Escritor único (group commit)
+ESCRITOR_MAX_OPERACOES_POR_LOTE = 256
+ESCRITOR_TIMEOUT_S = 30.0  # espera máxima de quem aguarda o commit de uma operação
+# BEGIN IMMEDIATE recusado (banco bloqueado por outro processo): novas tentativas com espera crescente
+ESCRITOR_TENTATIVAS_BEGIN = 6
+ESCRITOR_ESPERA_INICIAL_S = 0.05
+ESCRITOR_ESPERA_MAXIMA_S = 2.0
+
+_pools = {}
+_pools_lock = threading.Lock()
+_escritores = {}
+
+_bancos_inicializados = set()
+_inicializacao_lock = threading.Lock()
 
 def init_db():
-    os.makedirs("database", exist_ok=True)
-    
-    with get_db() as conn:
-        with open('database/schema.sql', 'r') as f:
-            conn.executescript(f.read())
+    # Roda uma vez por processo para cada arquivo de banco; nos reruns seguintes
+    # do Streamlit é só uma consulta a um set em memória
+    with _inicializacao_lock:
+        if DATABASE_PATH in _bancos_inicializados:
+            return
+        os.makedirs(os.path.dirname(DATABASE_PATH) or ".", exist_ok=True)
+        with get_db() as conn:
+            aplicar_migracoes(conn)
+        _bancos_inicializados.add(DATABASE_PATH)
+
+def aplicar_migracoes(conn) -> int:
+    # PRAGMA user_version guarda quantas migrações de MIGRACOES já foram aplicadas
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    for numero, migracao in enumerate(MIGRACOES[versao:], start=versao + 1):
+        logger.info("Aplicando migração %d: %s", numero, migracao.__name__)
+        migracao(conn)
+        conn.execute(f"PRAGMA user_version = {numero}")
+        conn.commit()
+    return len(MIGRACOES)
+
+def _migracao_1_esquema_base(conn):
+    # Cria o schema de database/schema.sql e adapta bancos criados antes do
+    # versionamento; todos os passos são idempotentes
+    _adicionar_colunas_novas(conn)
+    estatisticas_novas = not _tabela_existe(conn, 'estatisticas_status')
+    busca_nova = not _tabela_existe(conn, 'participantes_fts')
+    with open(ESQUEMA_BASE, 'r') as f:
+        conn.executescript(f.read())
+    _preencher_bitmasks(conn)
+    _preencher_indice_numeros(conn)
+    if estatisticas_novas:
+        reconstruir_estatisticas(conn)
+    if busca_nova:
+        conn.execute("INSERT INTO participantes_fts (participantes_fts) VALUES ('rebuild')")
+
+def _migracao_2_autenticacao(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS auth_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            access_code_hash TEXT NOT NULL
+        )
+    """)
+    if conn.execute("SELECT COUNT(*) FROM auth_config").fetchone()[0] == 0:
+        # Código de acesso inicial
+        codigo_padrao_hash = hashlib.sha256("algumasenhaaqui".encode()).hexdigest()
+        conn.execute("INSERT INTO auth_config (access_code_hash) VALUES (?)", (codigo_padrao_hash,))
+
+def _migracao_3_tokens_sessao(conn):
+    # Segredo dos tokens de sessão e geração da chave (incrementada ao trocar o código)
+    colunas = {row[1] for row in conn.execute("PRAGMA table_info(auth_config)")}
+    if 'geracao_chave' not in colunas:
+        conn.execute("ALTER TABLE auth_config ADD COLUMN geracao_chave INTEGER NOT NULL DEFAULT 1")
+    if 'segredo_tokens' not in colunas:
+        conn.execute("ALTER TABLE auth_config ADD COLUMN segredo_tokens TEXT")
+    conn.execute(
+        "UPDATE auth_config SET segredo_tokens = ? WHERE segredo_tokens IS NULL",
+        (secrets.token_hex(32),)
+    )
+
+def _migracao_4_resultados(conn):
+    # Resultado já pontuado de cada sorteio, válido enquanto versao_dados não mudar
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resultados (
+            sorteio_bitmask INTEGER PRIMARY KEY,
+            numeros_sorteados TEXT NOT NULL,
+            versao_dados INTEGER NOT NULL,
+            por_acertos TEXT NOT NULL,
+            premiados TEXT NOT NULL,
+            calculado_em TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+    """)
+
+def _migracao_5_versao_apostas(conn):
+    # Contador que só muda quando o conteúdo das apostas muda (inserção, remoção ou
+    # troca de números/nome): status e pagamentos não invalidam os resultados salvos
+    colunas = {row[1] for row in conn.execute("PRAGMA table_info(versao_dados)")}
+    if 'versao_apostas' not in colunas:
+        conn.execute("ALTER TABLE versao_dados ADD COLUMN versao_apostas INTEGER NOT NULL DEFAULT 0")
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_participantes_apostas_insert
+        AFTER INSERT ON participantes
+        BEGIN
+            UPDATE versao_dados SET versao_apostas = versao_apostas + 1 WHERE id = 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_participantes_apostas_update
+        AFTER UPDATE OF numeros_bitmask, nome ON participantes
+        BEGIN
+            UPDATE versao_dados SET versao_apostas = versao_apostas + 1 WHERE id = 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_participantes_apostas_delete
+        AFTER DELETE ON participantes
+        BEGIN
+            UPDATE versao_dados SET versao_apostas = versao_apostas + 1 WHERE id = 1;
+        END;
+    """)
+    # Os snapshots passam a ser indexados pelo novo contador; os antigos são descartados
+    conn.execute("DELETE FROM resultados")
+    conn.execute("ALTER TABLE resultados RENAME COLUMN versao_dados TO versao_apostas")
+
+# Novas alterações de schema entram no fim desta lista; nunca reordenar nem editar as já publicadas
+MIGRACOES = (
+    _migracao_1_esquema_base,
+    _migracao_2_autenticacao,
+    _migracao_3_tokens_sessao,
+    _migracao_4_resultados,
+    _migracao_5_versao_apostas,
+)
+
+def _tabela_existe(conn, nome: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nome,)
+    ).fetchone() is not None
+
+# Colunas adicionadas a participantes depois da versão inicial do schema
+COLUNAS_NOVAS_PARTICIPANTES = (
+    ('numeros_bitmask', 'INTEGER'),
+    ('quantidade_numeros', 'INTEGER NOT NULL DEFAULT 6'),
+)
+
+def _adicionar_colunas_novas(conn):
+    # Bancos criados antes dessas colunas precisam do ALTER TABLE,
+    # pois o CREATE TABLE IF NOT EXISTS do schema não altera tabelas existentes
+    colunas = {row[1] for row in conn.execute("PRAGMA table_info(participantes)")}
+    if not colunas:
+        return
+    for coluna, definicao in COLUNAS_NOVAS_PARTICIPANTES:
+        if coluna not in colunas:
+            conn.execute(f"ALTER TABLE participantes ADD COLUMN {coluna} {definicao}")
+
+def _preencher_bitmasks(conn):
+    pendentes = conn.execute(
+        "SELECT id, numeros_escolhidos FROM participantes WHERE numeros_bitmask IS NULL"
+    ).fetchall()
+    if pendentes:
+        atualizacoes = []
+        for row in pendentes:
+            numeros = [int(n) for n in row[1].split(',') if n.strip()]
+            atualizacoes.append((numeros_para_bitmask(numeros), len(numeros), row[0]))
+        conn.executemany(
+            "UPDATE participantes SET numeros_bitmask = ?, quantidade_numeros = ? WHERE id = ?",
+            atualizacoes
+        )
+
+def _preencher_indice_numeros(conn):
+    conn.execute("""
+        INSERT OR IGNORE INTO participante_numeros (participante_id, numero)
+        SELECT p.id, n.numero
+        FROM participantes p
+        JOIN numeros_megasena n ON (p.numeros_bitmask >> (n.numero - 1)) & 1
+        WHERE NOT EXISTS (
+            SELECT 1 FROM participante_numeros pn WHERE pn.participante_id = p.id
+        )
+    """)
+
+def reconstruir_estatisticas(conn):
+    # Recalcula do zero os agregados mantidos pelos triggers de participantes
+    conn.execute("DELETE FROM estatisticas_status")
+    conn.execute("""
+        INSERT INTO estatisticas_status (status_pagamento, total_participantes, total_arrecadado, total_cotas)
+        SELECT
+            COALESCE(status_pagamento, 'Pendente'),
+            COUNT(*),
+            COALESCE(SUM(valor_pago), 0),
+            COALESCE(SUM(COALESCE(quantidade_cotas, 0)), 0)
+        FROM participantes
+        GROUP BY COALESCE(status_pagamento, 'Pendente')
+    """)
+
+def conectar(caminho: str):
+    conn = sqlite3.connect(
+        caminho,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+class ConnectionPool:
+    """Pool de conexões SQLite reaproveitadas entre reruns e sessões do processo."""
+
+    def __init__(self, caminho: str, tamanho: int = POOL_TAMANHO, timeout: float = POOL_TIMEOUT):
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._criadas = 0
+        self._requisicoes = 0
+        self._hits = 0
+        self._esperas = 0
+        self._timeouts = 0
+        self._tempo_espera_total = 0.0
+        self._tempo_espera_max = 0.0
+
+    def _conectar(self):
+        return conectar(self.caminho)
+
+    def obter(self):
+        with self._lock:
+            self._requisicoes += 1
+        
+        try:
+            conn = self._livres.get_nowait()
+            with self._lock:
+                self._hits += 1
+            return conn
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            pode_criar = self._criadas < self.tamanho
+            if pode_criar:
+                self._criadas += 1
+        
+        if pode_criar:
+            try:
+                return self._conectar()
+            except Exception:
+                with self._lock:
+                    self._criadas -= 1
+                raise
+        
+        # Pool esgotado: espera alguma conexão ser devolvida
+        inicio = time.perf_counter()
+        try:
+            conn = self._livres.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise sqlite3.OperationalError(
+                f"Nenhuma conexão livre no pool após {self.timeout:.1f}s"
+            )
+        espera = time.perf_counter() - inicio
+        with self._lock:
+            self._esperas += 1
+            self._tempo_espera_total += espera
+            self._tempo_espera_max = max(self._tempo_espera_max, espera)
+        return conn
+
+    def devolver(self, conn):
+        try:
+            # Descarta transações não confirmadas, como o close() fazia antes
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            with self._lock:
+                self._criadas -= 1
+            return
+        self._livres.put(conn)
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                'tamanho': self.tamanho,
+                'conexoes_criadas': self._criadas,
+                'conexoes_livres': self._livres.qsize(),
+                'requisicoes': self._requisicoes,
+                'hits': self._hits,
+                'taxa_hit': self._hits / self._requisicoes if self._requisicoes else 0.0,
+                'esperas': self._esperas,
+                'timeouts': self._timeouts,
+                'tempo_espera_total_ms': self._tempo_espera_total * 1000,
+                'tempo_espera_max_ms': self._tempo_espera_max * 1000
+            }
+
+    def fechar(self):
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._criadas -= 1
+
+class EscritorUnico:
+    """Thread que detém a conexão de escrita e confirma as operações enfileiradas em grupo.
+
+    Cada operação é uma função que recebe a conexão; roda num SAVEPOINT próprio, então
+    uma falha desfaz só aquela operação. Tudo o que estiver na fila quando a thread fica
+    livre entra no mesmo COMMIT, e cada chamador recebe um Future com o seu resultado.
+    Operações `isoladas` (cargas em massa) ocupam um lote sozinhas e, como todo lote de
+    uma operação só, rodam sem SAVEPOINT: o diário de statements de um SAVEPOINT aberto
+    sobre milhares de linhas deixa cada bloco mais lento que o anterior.
+    """
+
+    _PARAR = object()
+
+    def __init__(self, caminho: str, max_por_lote: int = ESCRITOR_MAX_OPERACOES_POR_LOTE):
+        self.caminho = caminho
+        self.max_por_lote = max_por_lote
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._lotes = 0
+        self._operacoes = 0
+        self._falhas = 0
+        self._maior_lote = 0
+        self._retentativas = 0
+        self._thread = threading.Thread(target=self._executar, name="escritor-sqlite", daemon=True)
+        self._thread.start()
+
+    def enviar(self, operacao, isolada: bool = False) -> Future:
+        futuro = Future()
+        self._fila.put((operacao, futuro, isolada))
+        return futuro
+
+    def executar(self, operacao, timeout: Optional[float] = ESCRITOR_TIMEOUT_S, isolada: bool = False):
+        # Enfileira e espera o commit; devolve o resultado da operação ou levanta a exceção dela
+        return self.enviar(operacao, isolada).result(timeout=timeout)
+
+    def ativo(self) -> bool:
+        return self._thread.is_alive()
+
+    def _executar(self):
+        conn = conectar(self.caminho)
+        adiado = None
+        try:
+            while True:
+                item = adiado if adiado is not None else self._fila.get()
+                adiado = None
+                if item is self._PARAR:
+                    return
+                lote = [item]
+                parar = False
+                # Sem espera artificial: agrupa o que chegou enquanto o commit anterior rodava
+                while not lote[0][2] and len(lote) < self.max_por_lote:
+                    try:
+                        item = self._fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is self._PARAR:
+                        parar = True
+                        break
+                    if item[2]:
+                        # Operação isolada: fica para o próximo lote
+                        adiado = item
+                        break
+                    lote.append(item)
+                self._confirmar_lote(conn, lote)
+                if parar:
+                    return
+        finally:
+            conn.close()
+
+    def _iniciar_transacao(self, conn):
+        # O busy_timeout já espera alguns segundos; se outro processo segurar o banco por
+        # mais tempo, tenta de novo antes de desistir do lote inteiro
+        espera = ESCRITOR_ESPERA_INICIAL_S
+        for tentativa in range(1, ESCRITOR_TENTATIVAS_BEGIN + 1):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                mensagem = str(e).lower()
+                if tentativa == ESCRITOR_TENTATIVAS_BEGIN or ('locked' not in mensagem and 'busy' not in mensagem):
+                    raise
+                logger.warning(
+                    "Banco ocupado ao iniciar o lote (tentativa %d de %d); nova tentativa em %.2f s",
+                    tentativa, ESCRITOR_TENTATIVAS_BEGIN, espera
+                )
+                with self._lock:
+                    self._retentativas += 1
+                time.sleep(espera)
+                espera = min(espera * 2, ESCRITOR_ESPERA_MAXIMA_S)
+
+    def _confirmar_lote(self, conn, lote):
+        resultados = []
+        # Sozinha no lote, a operação que falhar desfaz a transação inteira: o efeito é o mesmo
+        usar_savepoint = len(lote) > 1
+        try:
+            self._iniciar_transacao(conn)
+            for operacao, futuro, _ in lote:
+                if not futuro.set_running_or_notify_cancel():
+                    continue
+                if usar_savepoint:
+                    conn.execute("SAVEPOINT operacao")
+                try:
+                    resultado = operacao(conn)
+                except Exception as e:
+                    if usar_savepoint:
+                        conn.execute("ROLLBACK TO operacao")
+                        conn.execute("RELEASE operacao")
+                    else:
+                        conn.rollback()
+                    futuro.set_exception(e)
+                    continue
+                if usar_savepoint:
+                    conn.execute("RELEASE operacao")
+                resultados.append((futuro, resultado))
+            if conn.in_transaction:
+                conn.commit()
+        except Exception as e:
+            logger.exception("Erro ao confirmar lote de %d operações", len(lote))
+            if conn.in_transaction:
+                conn.rollback()
+            for futuro, _ in resultados:
+                futuro.set_exception(e)
+            for _, futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            resultados = []
+        
+        for futuro, resultado in resultados:
+            futuro.set_result(resultado)
+        with self._lock:
+            self._lotes += 1
+            self._operacoes += len(lote)
+            self._falhas += sum(1 for _, futuro, _ in lote if not futuro.cancelled() and futuro.exception() is not None)
+            self._maior_lote = max(self._maior_lote, len(lote))
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                'lotes': self._lotes,
+                'operacoes': self._operacoes,
+                'falhas': self._falhas,
+                'maior_lote': self._maior_lote,
+                'retentativas': self._retentativas,
+                'operacoes_por_lote': self._operacoes / self._lotes if self._lotes else 0.0,
+                'pendentes': self._fila.qsize()
+            }
+
+    def fechar(self):
+        self._fila.put(self._PARAR)
+        self._thread.join()
+
+def get_escritor() -> EscritorUnico:
+    # Um escritor por arquivo de banco, compartilhado por todas as sessões do processo
+    with _pools_lock:
+        escritor = _escritores.get(DATABASE_PATH)
+        if escritor is None or not escritor.ativo():
+            escritor = _escritores[DATABASE_PATH] = EscritorUnico(DATABASE_PATH)
+        return escritor
+
+def obter_estatisticas_escritor() -> dict:
+    return get_escritor().estatisticas()
+
+def get_pool() -> ConnectionPool:
+    # Um pool por arquivo de banco, compartilhado por todas as sessões do processo
+    with _pools_lock:
+        pool = _pools.get(DATABASE_PATH)
+        if pool is None:
+            pool = _pools[DATABASE_PATH] = ConnectionPool(DATABASE_PATH)
+        return pool
+
+def obter_estatisticas_pool() -> dict:
+    return get_pool().estatisticas()
+
+def fechar_pools():
+    with _pools_lock:
+        for escritor in _escritores.values():
+            escritor.fechar()
+        _escritores.clear()
+        for pool in _pools.values():
+            pool.fechar()
+        _pools.clear()
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    # Mede separadamente a espera por uma conexão e o tempo em que ela fica emprestada
+    pool = get_pool()
+    inicio = time.perf_counter()
+    conn = pool.obter()
+    obtida = time.perf_counter()
+    registrar_latencia('get_db.obter', (obtida - inicio) * 1000)
+    erro = False
     try:
         yield conn
+    except BaseException:
+        erro = True
+        raise
     finally:
-        conn.close() 
\ No newline at end of file
+        pool.devolver(conn)
+        registrar_latencia('get_db', (time.perf_counter() - obtida) * 1000, erro)
@@ -0,0 +1,118 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Nível configurável por ambiente (DEBUG mostra o detalhe por registro carregado)
+LOG_LEVEL = os.environ.get("BOLAO_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Limites superiores dos baldes do histograma, em milissegundos (escala ~logarítmica)
+LIMITES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+def configurar_logging(nivel: str = None):
+    logging.basicConfig(level=nivel or LOG_LEVEL, format=LOG_FORMAT)
+
+class HistogramaLatencia:
+    """Contagem de chamadas por faixa de latência, com total e máximo."""
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_MS) + 1)
+        self.chamadas = 0
+        self.erros = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def registrar(self, duracao_ms: float, erro: bool = False):
+        self.baldes[bisect_left(LIMITES_MS, duracao_ms)] += 1
+        self.chamadas += 1
+        self.erros += erro
+        self.total_ms += duracao_ms
+        self.max_ms = max(self.max_ms, duracao_ms)
+
+    def percentil(self, fracao: float) -> float:
+        # Estimativa pelo limite superior do balde onde o percentil cai (nunca acima do máximo)
+        if not self.chamadas:
+            return 0.0
+        alvo = fracao * self.chamadas
+        acumulado = 0
+        for indice, quantidade in enumerate(self.baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(LIMITES_MS[indice], self.max_ms) if indice < len(LIMITES_MS) else self.max_ms
+        return self.max_ms
+
+    def resumo(self) -> dict:
+        return {
+            'chamadas': self.chamadas,
+            'erros': self.erros,
+            'total_ms': self.total_ms,
+            'media_ms': self.total_ms / self.chamadas if self.chamadas else 0.0,
+            'p50_ms': self.percentil(0.50),
+            'p95_ms': self.percentil(0.95),
+            'p99_ms': self.percentil(0.99),
+            'max_ms': self.max_ms,
+            'baldes': list(self.baldes)
+        }
+
+_histogramas = {}
+_histogramas_lock = threading.Lock()
+
+def registrar_latencia(nome: str, duracao_ms: float, erro: bool = False):
+    with _histogramas_lock:
+        histograma = _histogramas.get(nome)
+        if histograma is None:
+            histograma = _histogramas[nome] = HistogramaLatencia()
+        histograma.registrar(duracao_ms, erro)
+
+def obter_latencias() -> dict:
+    with _histogramas_lock:
+        return {nome: histograma.resumo() for nome, histograma in _histogramas.items()}
+
+def limpar_latencias():
+    with _histogramas_lock:
+        _histogramas.clear()
+
+@contextmanager
+def cronometrar(nome: str):
+    inicio = time.perf_counter()
+    erro = False
+    try:
+        yield
+    except BaseException:
+        erro = True
+        raise
+    finally:
+        registrar_latencia(nome, (time.perf_counter() - inicio) * 1000, erro)
+
+def medir_tempo(nome: str):
+    """Decorador que registra a latência de cada chamada no histograma `nome`.
+
+    Em funções geradoras o tempo medido é o da iteração completa.
+    """
+    def decorador(funcao):
+        if inspect.isgeneratorfunction(funcao):
+            @functools.wraps(funcao)
+            def gerador(*args, **kwargs):
+                with cronometrar(nome):
+                    yield from funcao(*args, **kwargs)
+            return gerador
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            with cronometrar(nome):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+def instrumentar(classe):
+    # Envolve todos os métodos estáticos da classe com medir_tempo("Classe.metodo")
+    for nome, atributo in list(vars(classe).items()):
+        if isinstance(atributo, staticmethod):
+            funcao = medir_tempo(f"{classe.__name__}.{nome}")(atributo.__func__)
+            setattr(classe, nome, staticmethod(funcao))
+    return classe
@@ -1,14 +1,202 @@
+-- Schema base (migração 1). Alterações novas vão para MIGRACOES em config/database.py
 CREATE TABLE IF NOT EXISTS participantes (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     nome TEXT NOT NULL,
     valor_pago REAL NOT NULL,
     numeros_escolhidos TEXT NOT NULL,
+    numeros_bitmask INTEGER,
+    quantidade_numeros INTEGER NOT NULL DEFAULT 6,
     data_pagamento TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     status_pagamento TEXT DEFAULT 'Pendente',
     quantidade_cotas INTEGER DEFAULT 1
 );
 
+CREATE INDEX IF NOT EXISTS idx_participantes_bitmask ON participantes(numeros_bitmask);
+
 CREATE TABLE IF NOT EXISTS auth_config (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     access_code_hash TEXT NOT NULL
-); 
\ No newline at end of file
+);
+
+-- Números válidos da Mega-Sena (1 a 60), usados para expandir os bitmasks
+CREATE TABLE IF NOT EXISTS numeros_megasena (
+    numero INTEGER PRIMARY KEY
+);
+
+INSERT OR IGNORE INTO numeros_megasena (numero)
+WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 60)
+SELECT n FROM seq;
+
+-- Índice invertido número -> aposta, mantido pelos triggers abaixo
+CREATE TABLE IF NOT EXISTS participante_numeros (
+    participante_id INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    PRIMARY KEY (participante_id, numero)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_participante_numeros_numero ON participante_numeros(numero, participante_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_numeros_insert
+AFTER INSERT ON participantes
+BEGIN
+    INSERT OR IGNORE INTO participante_numeros (participante_id, numero)
+    SELECT NEW.id, numero FROM numeros_megasena
+    WHERE (NEW.numeros_bitmask >> (numero - 1)) & 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_numeros_update
+AFTER UPDATE OF numeros_bitmask ON participantes
+BEGIN
+    DELETE FROM participante_numeros WHERE participante_id = OLD.id;
+    INSERT OR IGNORE INTO participante_numeros (participante_id, numero)
+    SELECT NEW.id, numero FROM numeros_megasena
+    WHERE (NEW.numeros_bitmask >> (numero - 1)) & 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_numeros_delete
+AFTER DELETE ON participantes
+BEGIN
+    DELETE FROM participante_numeros WHERE participante_id = OLD.id;
+END;
+
+-- Versão dos dados: incrementada a cada escrita em participantes, usada para
+-- invalidar os caches de leitura em todas as sessões e processos
+CREATE TABLE IF NOT EXISTS versao_dados (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    versao INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO versao_dados (id, versao) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_versao_insert
+AFTER INSERT ON participantes
+BEGIN
+    UPDATE versao_dados SET versao = versao + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_versao_update
+AFTER UPDATE ON participantes
+BEGIN
+    UPDATE versao_dados SET versao = versao + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_versao_delete
+AFTER DELETE ON participantes
+BEGIN
+    UPDATE versao_dados SET versao = versao + 1 WHERE id = 1;
+END;
+
+-- Agregados por status de pagamento, mantidos pelos triggers abaixo para que
+-- as estatísticas do painel não precisem percorrer a tabela participantes
+CREATE TABLE IF NOT EXISTS estatisticas_status (
+    status_pagamento TEXT PRIMARY KEY,
+    total_participantes INTEGER NOT NULL DEFAULT 0,
+    total_arrecadado REAL NOT NULL DEFAULT 0,
+    total_cotas INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_estatisticas_insert
+AFTER INSERT ON participantes
+BEGIN
+    INSERT INTO estatisticas_status (status_pagamento, total_participantes, total_arrecadado, total_cotas)
+    VALUES (COALESCE(NEW.status_pagamento, 'Pendente'), 1, NEW.valor_pago, COALESCE(NEW.quantidade_cotas, 0))
+    ON CONFLICT(status_pagamento) DO UPDATE SET
+        total_participantes = total_participantes + 1,
+        total_arrecadado = total_arrecadado + excluded.total_arrecadado,
+        total_cotas = total_cotas + excluded.total_cotas;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_estatisticas_update
+AFTER UPDATE OF status_pagamento, valor_pago, quantidade_cotas ON participantes
+BEGIN
+    UPDATE estatisticas_status SET
+        total_participantes = total_participantes - 1,
+        total_arrecadado = total_arrecadado - OLD.valor_pago,
+        total_cotas = total_cotas - COALESCE(OLD.quantidade_cotas, 0)
+    WHERE status_pagamento = COALESCE(OLD.status_pagamento, 'Pendente');
+    INSERT INTO estatisticas_status (status_pagamento, total_participantes, total_arrecadado, total_cotas)
+    VALUES (COALESCE(NEW.status_pagamento, 'Pendente'), 1, NEW.valor_pago, COALESCE(NEW.quantidade_cotas, 0))
+    ON CONFLICT(status_pagamento) DO UPDATE SET
+        total_participantes = total_participantes + 1,
+        total_arrecadado = total_arrecadado + excluded.total_arrecadado,
+        total_cotas = total_cotas + excluded.total_cotas;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_estatisticas_delete
+AFTER DELETE ON participantes
+BEGIN
+    UPDATE estatisticas_status SET
+        total_participantes = total_participantes - 1,
+        total_arrecadado = total_arrecadado - OLD.valor_pago,
+        total_cotas = total_cotas - COALESCE(OLD.quantidade_cotas, 0)
+    WHERE status_pagamento = COALESCE(OLD.status_pagamento, 'Pendente');
+END;
+
+-- Índices para filtros da listagem de participantes
+CREATE INDEX IF NOT EXISTS idx_participantes_status ON participantes(status_pagamento, id);
+CREATE INDEX IF NOT EXISTS idx_participantes_data ON participantes(data_pagamento);
+
+-- Busca textual por nome (FTS5 com conteúdo externo, sincronizada por triggers)
+CREATE VIRTUAL TABLE IF NOT EXISTS participantes_fts USING fts5(
+    nome,
+    content='participantes',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_fts_insert
+AFTER INSERT ON participantes
+BEGIN
+    INSERT INTO participantes_fts (rowid, nome) VALUES (NEW.id, NEW.nome);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_fts_update
+AFTER UPDATE OF nome ON participantes
+BEGIN
+    INSERT INTO participantes_fts (participantes_fts, rowid, nome) VALUES ('delete', OLD.id, OLD.nome);
+    INSERT INTO participantes_fts (rowid, nome) VALUES (NEW.id, NEW.nome);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_fts_delete
+AFTER DELETE ON participantes
+BEGIN
+    INSERT INTO participantes_fts (participantes_fts, rowid, nome) VALUES ('delete', OLD.id, OLD.nome);
+END;
+
+-- Histórico de concursos oficiais da Mega-Sena
+CREATE TABLE IF NOT EXISTS concursos (
+    concurso INTEGER PRIMARY KEY,
+    data_sorteio TEXT,
+    numeros_sorteados TEXT NOT NULL,
+    numeros_bitmask INTEGER NOT NULL,
+    backtest_processado INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_concursos_backtest_pendentes
+ON concursos(concurso) WHERE backtest_processado = 0;
+
+-- Backtest acumulado: para cada aposta, em quantos concursos processados ela fez 0..6 acertos.
+-- A existência da linha indica que a aposta já foi pontuada contra todos os concursos processados.
+CREATE TABLE IF NOT EXISTS backtest_apostas (
+    participante_id INTEGER PRIMARY KEY,
+    acertos_0 INTEGER NOT NULL DEFAULT 0,
+    acertos_1 INTEGER NOT NULL DEFAULT 0,
+    acertos_2 INTEGER NOT NULL DEFAULT 0,
+    acertos_3 INTEGER NOT NULL DEFAULT 0,
+    acertos_4 INTEGER NOT NULL DEFAULT 0,
+    acertos_5 INTEGER NOT NULL DEFAULT 0,
+    acertos_6 INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_backtest_update
+AFTER UPDATE OF numeros_bitmask ON participantes
+BEGIN
+    -- Aposta alterada: será pontuada de novo contra todo o histórico
+    DELETE FROM backtest_apostas WHERE participante_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_participantes_backtest_delete
+AFTER DELETE ON participantes
+BEGIN
+    DELETE FROM backtest_apostas WHERE participante_id = OLD.id;
+END;
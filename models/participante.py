@@ -1,8 +1,44 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Union
+from typing import Iterable, Iterator, List, Sequence, Union
+import logging
+import numpy as np
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+def numeros_para_bitmask(numeros: Iterable[int]) -> int:
+    # Cada número de 1 a 60 ocupa um bit (n - 1) de um inteiro de 60 bits
+    bitmask = 0
+    for num in numeros:
+        bitmask |= 1 << (int(num) - 1)
+    return bitmask
+
+
+def bitmask_para_numeros(bitmask: int) -> List[int]:
+    bitmask = int(bitmask)
+    return [num for num in range(1, 61) if bitmask >> (num - 1) & 1]
+
+
+def parse_numeros(texto: str) -> List[int]:
+    # Aceita "1,2,3", "01 02 03" ou "[1, 2, 3]"; qualquer outra coisa é rejeitada (sem eval)
+    texto = texto.strip()
+    if texto.startswith('[') and texto.endswith(']'):
+        texto = texto[1:-1]
+    numeros = []
+    for parte in texto.replace(',', ' ').split():
+        if not (parte.isascii() and parte.isdigit() and len(parte) <= 2):
+            raise ValueError(f"Número inválido: {parte!r}")
+        numero = int(parte)
+        if not 1 <= numero <= 60:
+            raise ValueError(f"Número fora do intervalo 1-60: {numero}")
+        numeros.append(numero)
+    if len(set(numeros)) != len(numeros):
+        raise ValueError("Números repetidos na aposta")
+    return numeros
+
+
+@dataclass(slots=True)
 class Participante:
     nome: str
     valor_pago: float
@@ -19,10 +55,101 @@ class Participante:
         # Garantir que numeros_escolhidos seja uma lista de inteiros
         if isinstance(self.numeros_escolhidos, str):
             try:
-                if ',' in self.numeros_escolhidos:
-                    self.numeros_escolhidos = [int(n.strip()) for n in self.numeros_escolhidos.split(',') if n.strip()]
-                else:
-                    self.numeros_escolhidos = eval(self.numeros_escolhidos)
-            except Exception as e:
-                print(f"Erro ao converter números escolhidos: {e}")
-                self.numeros_escolhidos = []
\ No newline at end of file
+                self.numeros_escolhidos = parse_numeros(self.numeros_escolhidos)
+            except ValueError:
+                logger.warning("Erro ao converter números escolhidos: %r", self.numeros_escolhidos, exc_info=True)
+                self.numeros_escolhidos = []
+
+    @classmethod
+    def do_banco(cls, id, nome, valor_pago, numeros_escolhidos, data_pagamento, status_pagamento, quantidade_cotas):
+        # Hidratação de linhas já validadas: sem __post_init__, sem data padrão e com
+        # o parse direto do formato canônico gravado ("1,2,3")
+        participante = object.__new__(cls)
+        participante.id = id
+        participante.nome = nome
+        participante.valor_pago = float(valor_pago)
+        participante.numeros_escolhidos = list(map(int, numeros_escolhidos.split(','))) if numeros_escolhidos else []
+        participante.data_pagamento = data_pagamento
+        participante.status_pagamento = status_pagamento
+        participante.quantidade_cotas = int(quantidade_cotas)
+        return participante
+
+    @property
+    def numeros_bitmask(self) -> int:
+        return numeros_para_bitmask(self.numeros_escolhidos)
+
+
+class ParticipantesBatch:
+    """Participantes em colunas (arrays NumPy), sem um objeto Python por linha.
+
+    Os números de cada aposta ficam no bitmask; o status é guardado como código
+    de categoria. Objetos Participante só são criados sob demanda.
+    """
+
+    __slots__ = ('ids', 'nomes', 'valores_pagos', 'bitmasks', 'datas_pagamento',
+                 'status_categorias', 'status_codigos', 'quantidade_cotas')
+
+    def __init__(self, ids, nomes, valores_pagos, bitmasks, datas_pagamento,
+                 status_categorias, status_codigos, quantidade_cotas):
+        self.ids = ids
+        self.nomes = nomes
+        self.valores_pagos = valores_pagos
+        self.bitmasks = bitmasks
+        self.datas_pagamento = datas_pagamento
+        self.status_categorias = status_categorias
+        self.status_codigos = status_codigos
+        self.quantidade_cotas = quantidade_cotas
+
+    @classmethod
+    def das_linhas(cls, rows: Sequence) -> 'ParticipantesBatch':
+        # rows: (id, nome, valor_pago, numeros_bitmask, data_pagamento, status_pagamento, quantidade_cotas)
+        if not rows:
+            return cls(np.empty(0, np.int64), [], np.empty(0), np.empty(0, np.uint64), [],
+                       (), np.empty(0, np.uint8), np.empty(0, np.int32))
+        ids, nomes, valores, bitmasks, datas, status, cotas = zip(*rows)
+        categorias = {}
+        codigos = np.fromiter(
+            (categorias.setdefault(s, len(categorias)) for s in status), dtype=np.uint8, count=len(status)
+        )
+        return cls(
+            ids=np.array(ids, dtype=np.int64),
+            nomes=list(nomes),
+            valores_pagos=np.array(valores, dtype=np.float64),
+            bitmasks=np.array(bitmasks, dtype=np.uint64),
+            datas_pagamento=list(datas),
+            status_categorias=tuple(categorias),
+            status_codigos=codigos,
+            quantidade_cotas=np.array(cotas, dtype=np.int32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, indice: int) -> Participante:
+        participante = object.__new__(Participante)
+        participante.id = int(self.ids[indice])
+        participante.nome = self.nomes[indice]
+        participante.valor_pago = float(self.valores_pagos[indice])
+        participante.numeros_escolhidos = self.numeros(indice)
+        participante.data_pagamento = self.datas_pagamento[indice]
+        participante.status_pagamento = self.status(indice)
+        participante.quantidade_cotas = int(self.quantidade_cotas[indice])
+        return participante
+
+    def __iter__(self) -> Iterator[Participante]:
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def numeros(self, indice: int) -> List[int]:
+        return bitmask_para_numeros(self.bitmasks[indice])
+
+    def status(self, indice: int) -> str:
+        return self.status_categorias[self.status_codigos[indice]]
+
+    def mascara_status(self, status: str) -> np.ndarray:
+        if status not in self.status_categorias:
+            return np.zeros(len(self), dtype=bool)
+        return self.status_codigos == self.status_categorias.index(status)
+
+    def valor_total(self) -> float:
+        return float(self.valores_pagos.sum())
@@ -0,0 +1,104 @@
+import streamlit as st
+import pandas as pd
+from services.analise_service import AnaliseService
+
+def _heatmap_volante(frequencia):
+    import altair as alt
+
+    # Mesmo desenho do volante da Mega-Sena: 6 linhas de 10 números
+    df = pd.DataFrame({
+        'numero': range(1, 61),
+        'apostas': frequencia,
+        'linha': [(n - 1) // 10 for n in range(1, 61)],
+        'coluna': [(n - 1) % 10 for n in range(1, 61)]
+    })
+    df['rotulo'] = df['numero'].map(lambda n: f"{n:02d}")
+    base = alt.Chart(df).encode(
+        x=alt.X('coluna:O', axis=None),
+        y=alt.Y('linha:O', axis=None)
+    )
+    celulas = base.mark_rect(cornerRadius=4).encode(
+        color=alt.Color('apostas:Q', scale=alt.Scale(scheme='greens'), title="Apostas"),
+        tooltip=[alt.Tooltip('rotulo:N', title="Número"), alt.Tooltip('apostas:Q', title="Apostas")]
+    )
+    textos = base.mark_text(fontWeight='bold').encode(text='rotulo:N')
+    return (celulas + textos).properties(height=260)
+
+def _heatmap_pares(matriz, titulo):
+    import altair as alt
+
+    # Só o triângulo superior: a matriz é simétrica
+    df = pd.DataFrame(
+        [
+            {'a': f"{a + 1:02d}", 'b': f"{b + 1:02d}", 'valor': float(matriz[a, b])}
+            for a in range(60) for b in range(a + 1, 60)
+        ]
+    )
+    return alt.Chart(df).mark_rect().encode(
+        x=alt.X('b:O', title=None, axis=alt.Axis(labelFontSize=8)),
+        y=alt.Y('a:O', title=None, axis=alt.Axis(labelFontSize=8)),
+        color=alt.Color('valor:Q', scale=alt.Scale(scheme='orangered'), title=titulo),
+        tooltip=[
+            alt.Tooltip('a:N', title="Número"),
+            alt.Tooltip('b:N', title="Número"),
+            alt.Tooltip('valor:Q', title=titulo, format='.2f')
+        ]
+    ).properties(height=620)
+
+def _tabela_combinacoes(combinacoes):
+    return pd.DataFrame([
+        {
+            'Números': ' - '.join(f"{n:02d}" for n in combinacao['numeros']),
+            'Apostas': combinacao['apostas'],
+            'Acima do esperado': f"{combinacao['razao']:.2f}x"
+        }
+        for combinacao in combinacoes
+    ])
+
+def app():
+    cobertura = AnaliseService.cobertura_numeros()
+    if not cobertura['total_apostas']:
+        st.info("Nenhum participante cadastrado ainda.")
+        return
+
+    col_apostas, col_cobertos, col_faltando = st.columns(3)
+    col_apostas.metric("Apostas", cobertura['total_apostas'])
+    col_cobertos.metric("Números cobertos", f"{cobertura['numeros_cobertos']}/60")
+    col_faltando.metric(
+        "Números sem aposta",
+        len(cobertura['nao_escolhidos']),
+        help=', '.join(f"{n:02d}" for n in cobertura['nao_escolhidos']) or None
+    )
+
+    st.subheader("🔢 Frequência por número")
+    st.altair_chart(_heatmap_volante(cobertura['frequencia']), use_container_width=True)
+    st.caption(
+        f"Mais escolhidos: {', '.join(f'{n:02d}' for n in cobertura['mais_escolhidos'])} · "
+        f"Menos escolhidos: {', '.join(f'{n:02d}' for n in cobertura['menos_escolhidos'])}"
+    )
+
+    st.subheader("🔗 Pares de números")
+    medida = st.radio(
+        "Medida",
+        options=["Apostas com o par", "Acima do esperado"],
+        horizontal=True,
+        help="Acima do esperado: apostas com o par divididas pelo que se esperaria "
+             "se cada número fosse escolhido de forma independente"
+    )
+    coocorrencia = AnaliseService.coocorrencia()
+    if medida == "Apostas com o par":
+        st.altair_chart(_heatmap_pares(coocorrencia['pares'], "Apostas"), use_container_width=True)
+    else:
+        st.altair_chart(_heatmap_pares(coocorrencia['razao'], "Razão"), use_container_width=True)
+
+    st.markdown("**Pares mais frequentes**")
+    st.dataframe(_tabela_combinacoes(AnaliseService.pares_frequentes()), use_container_width=True, hide_index=True)
+
+    with st.expander("🔺 Trios mais frequentes"):
+        if st.toggle("Calcular trios", help="Percorre todos os trios de cada aposta"):
+            with st.spinner("Contando trios..."):
+                trios = AnaliseService.trios_frequentes()
+            if trios:
+                st.dataframe(_tabela_combinacoes(trios), use_container_width=True, hide_index=True)
+            else:
+                st.info("Nenhum trio aparece em mais de uma aposta.")
@@ -0,0 +1,173 @@
+import streamlit as st
+from math import comb
+from models.participante import Participante
+from services.participante_service import ParticipanteService
+
+def app():
+    from services.analise_service import AnaliseService
+    
+    # A cobertura usada em "Sugerir números" é montada em segundo plano desde já
+    AnaliseService.preparar_sugestoes()
+    
+    # Sidebar para informações de pagamento
+    with st.sidebar:
+        st.header("💰 Dados para Pagamento")
+        st.write(f"Valor da Cota: R$ {ParticipanteService.VALOR_COTA:.2f}")
+    
+        with st.expander("📱 Pagar com PIX", expanded=True):
+            st.markdown("""
+                ### Chave PIX
+                ```
+                12345678900
+                ```
+                **Tipo:** CPF
+            
+                ### Dados do Beneficiário
+                **Nome:** João da Silva
+                **Banco:** NuBank
+            """)
+
+    # Valores do formulário definidos antes de desenhá-lo (um widget não muda depois de criado)
+    if st.session_state.pop('cadastro_limpar', False):
+        st.session_state.cadastro_nome = ""
+        st.session_state.cadastro_numeros = []
+        st.session_state.pop('cadastro_sugestao_info', None)
+    if 'cadastro_sugestao' in st.session_state:
+        st.session_state.cadastro_numeros = st.session_state.pop('cadastro_sugestao')
+
+    # Formulário de cadastro
+    with st.form("novo_participante"):
+        nome = st.text_input("Nome do Participante", key="cadastro_nome")
+        status_pagamento = st.selectbox(
+            "Status do Pagamento",
+            options=["Pendente", "Pago", "Confirmado"],
+            index=0
+        )
+    
+        # Seleção de números
+        numeros_disponiveis = list(range(1, 61))
+        numeros_selecionados = st.multiselect(
+            f"Selecione de {ParticipanteService.MIN_NUMEROS} a {ParticipanteService.MAX_NUMEROS} números:",
+            options=numeros_disponiveis,
+            max_selections=ParticipanteService.MAX_NUMEROS,
+            format_func=lambda x: f"{x:02d}",
+            key="cadastro_numeros"
+        )
+        
+        sugestao = st.session_state.get('cadastro_sugestao_info')
+        if sugestao and sorted(numeros_selecionados) == sugestao['numeros']:
+            st.caption(
+                f"✨ Sugestão: {sugestao['quadras_novas']} de {sugestao['quadras_total']} quadras e "
+                f"{sugestao['pares_novos']} de {sugestao['pares_total']} pares ainda sem aposta no bolão."
+            )
+    
+        # Exibir números selecionados
+        if numeros_selecionados:
+            st.markdown(
+                """
+                <div class="numeros-selecionados-container">
+                    <h4>Números selecionados:</h4>
+                    """ +
+                "".join([f'<span class="numero-selecionado-badge">{num:02d}</span>' 
+                         for num in sorted(numeros_selecionados)]) +
+                "</div>",
+                unsafe_allow_html=True
+            )
+            if len(numeros_selecionados) > ParticipanteService.MIN_NUMEROS:
+                st.caption(
+                    f"Aposta estendida: {len(numeros_selecionados)} números equivalem a "
+                    f"{comb(len(numeros_selecionados), 6)} jogos de 6 números."
+                )
+    
+        permitir_duplicada = st.checkbox(
+            "Permitir aposta idêntica a outra já cadastrada",
+            value=False
+        )
+    
+        # Botões de ação
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            limpar = st.form_submit_button("🎲 Limpar Seleção", type="secondary")
+    
+        with col2:
+            sugerir = st.form_submit_button(
+                "✨ Sugerir números",
+                help="Completa a seleção com os números que mais ampliam a cobertura do bolão"
+            )
+    
+        with col3:
+            submitted = st.form_submit_button("✅ Adicionar Participante", type="primary")
+    
+        if limpar:
+            st.session_state.cadastro_limpar = True
+            st.rerun()
+    
+        if sugerir:
+            # Com menos de 6 números escolhidos, eles ficam e a sugestão completa a aposta
+            quantidade = max(ParticipanteService.MIN_NUMEROS, len(numeros_selecionados))
+            sugestao = AnaliseService.sugerir_numeros(
+                quantidade=quantidade,
+                fixos=numeros_selecionados if len(numeros_selecionados) < quantidade else ()
+            )
+            st.session_state.cadastro_sugestao = sugestao['numeros']
+            st.session_state.cadastro_sugestao_info = sugestao
+            st.rerun()
+    
+        if submitted:
+            if not nome:
+                st.error("Por favor, preencha o nome do participante!")
+            elif not ParticipanteService.MIN_NUMEROS <= len(numeros_selecionados) <= ParticipanteService.MAX_NUMEROS:
+                st.error(
+                    f"Por favor, escolha de {ParticipanteService.MIN_NUMEROS} "
+                    f"a {ParticipanteService.MAX_NUMEROS} números!"
+                )
+            else:
+                novo_participante = Participante(
+                    nome=nome,
+                    valor_pago=ParticipanteService.VALOR_COTA,
+                    numeros_escolhidos=numeros_selecionados,
+                    status_pagamento=status_pagamento
+                )
+            
+                identicas = ParticipanteService.buscar_apostas_identicas(numeros_selecionados)
+                if identicas and not permitir_duplicada:
+                    st.warning(
+                        "Essa aposta já foi cadastrada por: "
+                        + ", ".join(aposta['nome'] for aposta in identicas)
+                        + ". Marque a opção de permitir aposta idêntica para cadastrá-la mesmo assim."
+                    )
+                else:
+                    # A gravação passa pelo escritor único; o Future confirma esta submissão
+                    futuro = ParticipanteService.enfileirar_participante(
+                        novo_participante,
+                        rejeitar_duplicada=not permitir_duplicada
+                    )
+                    try:
+                        futuro.result(timeout=ParticipanteService.TIMEOUT_ESCRITA_S)
+                    except Exception as e:
+                        st.error(f"Não foi possível adicionar o participante: {e}")
+                    else:
+                        st.success("Participante adicionado com sucesso!")
+                        st.session_state.cadastro_limpar = True
+                        st.rerun()
+
+    # Importação em lote a partir de planilha
+    with st.expander("📤 Importar participantes de planilha (CSV/XLSX)"):
+        st.caption(
+            "Colunas esperadas: **nome**, **numeros** (ex.: 01 02 03 04 05 06, até 15 números) "
+            "ou uma coluna por dezena (n1 a n15), e opcionalmente **status** e **cotas**."
+        )
+        arquivo = st.file_uploader("Planilha", type=["csv", "xlsx"])
+        if arquivo is not None and st.button("📥 Importar planilha", type="primary"):
+            from services.importacao import importar_planilha
+        
+            with st.spinner("Importando participantes..."):
+                resultado = importar_planilha(arquivo, arquivo.name)
+        
+            if resultado['erro_geral']:
+                st.error(f"Erro ao importar planilha; nenhum participante foi importado: {resultado['erro_geral']}")
+            else:
+                st.success(f"{resultado['inseridos']} participantes importados com sucesso!")
+            if resultado['erros']:
+                st.warning(f"{len(resultado['erros'])} linhas não foram importadas:")
+                st.dataframe(resultado['erros'], use_container_width=True)
@@ -0,0 +1,109 @@
+import logging
+import streamlit as st
+import pandas as pd
+from config.database import obter_estatisticas_escritor, obter_estatisticas_pool
+from auth.auth_service import AuthService
+from config.monitoramento import LIMITES_MS, limpar_latencias, obter_latencias
+from services.participante_service import ParticipanteService
+
+NIVEIS_LOG = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+def _rotulos_baldes():
+    anteriores = (0,) + LIMITES_MS
+    return [f"{inicio:g}–{fim:g} ms" for inicio, fim in zip(anteriores, LIMITES_MS)] + [f"> {LIMITES_MS[-1]:g} ms"]
+
+def controles_admin() -> bool:
+    # A página é vista por qualquer sessão logada; os controles do processo pedem o código de administrador
+    if AuthService.is_admin():
+        return True
+    if not AuthService.admin_enabled():
+        st.caption(f"Controles de administração desativados (defina {AuthService.ADMIN_CODE_ENV} para ativá-los).")
+        return False
+    with st.expander("🔑 Controles de administração"):
+        with st.form("diagnostico_admin"):
+            codigo = st.text_input("Código de administrador", type="password")
+            if st.form_submit_button("Liberar"):
+                if AuthService.verify_admin_code(codigo):
+                    st.rerun()
+                st.error("Código de administrador inválido!")
+    return False
+
+def app():
+    # Conexões e cache de leituras
+    stats_pool = obter_estatisticas_pool()
+    stats_cache = ParticipanteService.estatisticas_cache()
+    col_pool, col_espera, col_cache = st.columns(3)
+    col_pool.metric(
+        "Reaproveitamento de conexões",
+        f"{stats_pool['taxa_hit']:.0%}",
+        help=f"{stats_pool['conexoes_criadas']}/{stats_pool['tamanho']} conexões "
+             f"({stats_pool['conexoes_livres']} livres)"
+    )
+    col_espera.metric(
+        "Esperas por conexão",
+        stats_pool['esperas'],
+        help=f"máx. {stats_pool['tempo_espera_max_ms']:.1f} ms, {stats_pool['timeouts']} timeouts"
+    )
+    col_cache.metric(
+        "Acertos do cache de leituras",
+        f"{stats_cache['taxa_hit']:.0%}",
+        help=f"{stats_cache['itens']}/{stats_cache['tamanho_maximo']} itens"
+    )
+
+    stats_escritor = obter_estatisticas_escritor()
+    col_lotes, col_por_lote, col_falhas = st.columns(3)
+    col_lotes.metric("Commits do escritor", stats_escritor['lotes'],
+                     help=f"{stats_escritor['pendentes']} operações na fila")
+    col_por_lote.metric("Operações por commit", f"{stats_escritor['operacoes_por_lote']:.1f}",
+                        help=f"maior lote: {stats_escritor['maior_lote']}")
+    col_falhas.metric("Operações recusadas", stats_escritor['falhas'],
+                      help=f"{stats_escritor['retentativas']} novas tentativas com o banco ocupado")
+
+    # Nível de log do processo: afeta todas as sessões (em DEBUG, registra dados dos
+    # participantes), então só o administrador altera
+    raiz = logging.getLogger()
+    nivel_atual = logging.getLevelName(raiz.level)
+    admin = controles_admin()
+    if admin:
+        nivel = st.selectbox(
+            "Nível de log",
+            options=NIVEIS_LOG,
+            index=NIVEIS_LOG.index(nivel_atual) if nivel_atual in NIVEIS_LOG else 1
+        )
+        if nivel != nivel_atual:
+            raiz.setLevel(nivel)
+    else:
+        st.caption(f"Nível de log: {nivel_atual}")
+
+    st.subheader("⏱️ Latência por operação")
+    latencias = obter_latencias()
+    if not latencias:
+        st.info("Nenhuma chamada medida ainda neste processo.")
+        return
+
+    df_latencias = pd.DataFrame([
+        {
+            'Operação': nome,
+            'Chamadas': resumo['chamadas'],
+            'Erros': resumo['erros'],
+            'Total (ms)': round(resumo['total_ms'], 1),
+            'Média (ms)': round(resumo['media_ms'], 2),
+            'p50 (ms)': resumo['p50_ms'],
+            'p95 (ms)': resumo['p95_ms'],
+            'p99 (ms)': resumo['p99_ms'],
+            'Máx. (ms)': round(resumo['max_ms'], 1)
+        }
+        for nome, resumo in latencias.items()
+    ]).sort_values('Total (ms)', ascending=False)
+    st.dataframe(df_latencias, use_container_width=True, hide_index=True)
+    st.caption("Percentis estimados pelo limite superior da faixa do histograma.")
+
+    operacao = st.selectbox("Histograma da operação", options=df_latencias['Operação'].tolist())
+    st.bar_chart(pd.DataFrame(
+        {'Chamadas': latencias[operacao]['baldes']},
+        index=pd.CategoricalIndex(_rotulos_baldes(), categories=_rotulos_baldes(), ordered=True)
+    ))
+
+    if admin and st.button("🧹 Zerar medições"):
+        limpar_latencias()
+        st.rerun()
@@ -1,26 +1,25 @@
 import streamlit as st
 from auth.auth_service import AuthService
+from math import ceil
 import time
 
 def init_session_state():
     if 'authentication_status' not in st.session_state:
-        # Tenta recuperar o status de autenticação do cookie
-        if st.session_state.get('_cookie_auth_status'):
-            st.session_state.authentication_status = True
-        else:
-            st.session_state.authentication_status = False
+        # Recupera a sessão pelo token assinado no cookie, que sobrevive a recarregar a página;
+        # a verificação é só um HMAC com a chave em memória, sem consultar o banco
+        token = AuthService.saved_token()
+        st.session_state.authentication_status = bool(token) and AuthService.verify_token(token)
 
 def show_login_page():
     init_session_state()
+    AuthService.sync_cookie()
     
     # Verifica se já está autenticado
     if st.session_state.authentication_status:
         col1, col2 = st.columns([8, 2])
         with col2:
             if st.button("🚪 Sair"):
-                st.session_state.authentication_status = False
-                # Remove o cookie de autenticação
-                st.session_state['_cookie_auth_status'] = False
+                AuthService.logout()
                 st.rerun()
         return True
     
@@ -33,11 +32,14 @@ def show_login_page():
         submitted = st.form_submit_button("Entrar")
         
         if submitted:
-            if AuthService.verify_access_code(access_code):
+            espera = AuthService.retry_after()
+            if espera > 0:
+                st.error(f"Muitas tentativas de login. Tente novamente em {ceil(espera)} s.")
+            elif AuthService.verify_access_code(access_code):
                 st.session_state.authentication_status = True
                 if remember_me:
-                    # Salva o status de autenticação no cookie
-                    st.session_state['_cookie_auth_status'] = True
+                    # Token assinado e com validade, gravado em cookie na próxima renderização
+                    AuthService.remember()
                 st.success("Login realizado com sucesso!")
                 time.sleep(1)
                 st.rerun()
@@ -2,11 +2,71 @@ import streamlit as st
 import pandas as pd
 from services.participante_service import ParticipanteService
 
-def app():
+TAMANHOS_PAGINA = [25, 50, 100, 200]
+
+def _estado_paginacao(tamanho_pagina, filtros):
+    # Pilha de cursores (último id da página anterior); reinicia ao mudar o tamanho ou os filtros
+    chave = (tamanho_pagina, repr(sorted(filtros.items())))
+    if st.session_state.get('participantes_paginacao_chave') != chave:
+        st.session_state.participantes_paginacao_chave = chave
+        st.session_state.participantes_cursores = [None]
+    return st.session_state.participantes_cursores
+
+def _filtros():
+    with st.expander("🔎 Buscar e filtrar", expanded=False):
+        col_nome, col_status = st.columns(2)
+        with col_nome:
+            nome = st.text_input("Nome")
+        with col_status:
+            status = st.multiselect("Status", options=["Pendente", "Pago", "Confirmado"])
+        
+        col_datas, col_numeros = st.columns(2)
+        with col_datas:
+            periodo = st.date_input("Data de pagamento", value=(), format="DD/MM/YYYY")
+        with col_numeros:
+            numeros = st.multiselect(
+                "Contém os números",
+                options=list(range(1, 61)),
+                format_func=lambda x: f"{x:02d}"
+            )
     
-    participantes = ParticipanteService.listar_participantes()
-    if participantes:
-        # Convertendo para DataFrame para exibição
+    periodo = tuple(periodo) if isinstance(periodo, (list, tuple)) else (periodo,)
+    return {
+        'nome': nome.strip() or None,
+        'status': tuple(status) or None,
+        'data_inicio': periodo[0] if len(periodo) >= 1 else None,
+        'data_fim': periodo[1] if len(periodo) >= 2 else None,
+        'numeros': tuple(numeros) or None
+    }
+
+def app():
+
+    if not ParticipanteService.contar_participantes():
+        st.info("Nenhum participante cadastrado ainda.")
+        return
+
+    filtros = _filtros()
+    total_participantes = ParticipanteService.contar_participantes(**filtros)
+    if total_participantes:
+        col_info, col_tamanho = st.columns([3, 1])
+        with col_tamanho:
+            tamanho_pagina = st.selectbox("Por página", options=TAMANHOS_PAGINA, index=1)
+
+        cursores = _estado_paginacao(tamanho_pagina, filtros)
+        participantes = ParticipanteService.buscar_participantes(cursores[-1], tamanho_pagina, **filtros)
+        if not participantes and len(cursores) > 1:
+            # A página atual ficou vazia (ex.: registros removidos); volta ao início
+            cursores[:] = [None]
+            participantes = ParticipanteService.buscar_participantes(None, tamanho_pagina, **filtros)
+
+        total_paginas = max(1, -(-total_participantes // tamanho_pagina))
+        with col_info:
+            st.caption(
+                f"Página {len(cursores)} de {total_paginas} — "
+                f"{total_participantes} participantes"
+            )
+
+        # Convertendo para DataFrame para exibição (apenas a página atual)
         df_participantes = pd.DataFrame([
             {
                 'ID': p.id,
@@ -18,7 +78,7 @@ def app():
             }
             for p in participantes
         ])
-        
+
         # Adicionar estilo condicional baseado no status
         def highlight_status(val):
             if val == 'Pago':
@@ -31,45 +91,174 @@ def app():
 
         # Exibir DataFrame com estilo
         st.dataframe(
-            df_participantes.style.applymap(
+            df_participantes.style.map(
                 highlight_status,
                 subset=['Status']
             ),
             use_container_width=True
         )
-        
-        # Adicionar seção para atualizar status
+
+        # Navegação entre páginas
+        col_anterior, col_proxima = st.columns(2)
+        with col_anterior:
+            if st.button("◀ Anterior", disabled=len(cursores) == 1):
+                cursores.pop()
+                st.rerun()
+        with col_proxima:
+            if st.button("Próxima ▶", disabled=len(cursores) >= total_paginas):
+                cursores.append(participantes[-1].id)
+                st.rerun()
+
+        # Atualização de status em lote: marca as linhas da página e aplica num único UPDATE
         st.subheader("Atualizar Status de Pagamento")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            participante_id = st.selectbox(
-                "Selecione o Participante",
-                options=df_participantes['ID'].tolist(),
-                format_func=lambda x: df_participantes[df_participantes['ID'] == x]['Nome'].iloc[0]
-            )
+        chave_selecao = f"selecao_status_{cursores[-1]}"
+        selecao = st.data_editor(
+            pd.DataFrame({
+                'Selecionar': False,
+                'ID': [p.id for p in participantes],
+                'Nome': [p.nome for p in participantes],
+                'Status': [p.status_pagamento for p in participantes]
+            }),
+            column_config={'Selecionar': st.column_config.CheckboxColumn("✔", default=False)},
+            disabled=['ID', 'Nome', 'Status'],
+            hide_index=True,
+            use_container_width=True,
+            key=chave_selecao
+        )
+        ids_selecionados = selecao.loc[selecao['Selecionar'], 'ID'].tolist()
         
-        with col2:
+        col_status, col_aplicar = st.columns([3, 1])
+        with col_status:
             novo_status = st.selectbox(
                 "Novo Status",
-                options=["Pendente", "Pago", "Confirmado"],
+                options=list(ParticipanteService.STATUS_VALIDOS),
                 key="novo_status"
             )
+        with col_aplicar:
+            if st.button(
+                f"Atualizar {len(ids_selecionados)} selecionado(s)",
+                type="primary",
+                disabled=not ids_selecionados
+            ):
+                alterados = ParticipanteService.atualizar_status_em_lote(ids_selecionados, novo_status)
+                st.session_state.pop(chave_selecao, None)
+                st.success(f"{alterados} participante(s) atualizado(s) para {novo_status}")
+                st.rerun()
+
+        conciliacao_extrato()
+
+        # Exportação gerada só no clique em baixar, numa thread à parte (função em `data`,
+        # Streamlit 1.52+): os blocos lidos do banco vão para um arquivo temporário, que o
+        # Streamlit entrega ao navegador
+        from services import exportacao
         
-        with col3:
-            if st.button("Atualizar Status", type="primary"):
-                if ParticipanteService.atualizar_status_pagamento(participante_id, novo_status):
-                    st.success(f"Status atualizado com sucesso!")
-                    st.rerun()
-                else:
-                    st.error("Erro ao atualizar status")
-        
-        # Botão para baixar dados
-        st.download_button(
-            label="📥 Baixar dados em Excel",
-            data=df_participantes.to_csv(index=False).encode('utf-8'),
-            file_name='bolao_mega_sena.csv',
-            mime='text/csv'
-        )
+        st.subheader("📥 Exportar dados")
+        col_formato, col_baixar = st.columns([3, 1])
+        with col_formato:
+            formato = st.radio(
+                "Formato",
+                options=["CSV (planilha)", "Parquet (colunas tipadas)"],
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+        if formato.startswith("CSV"):
+            gerar, nome_arquivo, mime = exportacao.exportar_csv_em_arquivo, 'bolao_mega_sena.csv', 'text/csv'
+        else:
+            gerar, nome_arquivo, mime = (
+                exportacao.exportar_parquet, 'bolao_mega_sena.parquet', 'application/vnd.apache.parquet'
+            )
+        with col_baixar:
+            st.download_button(
+                label="📥 Baixar arquivo",
+                data=gerar,
+                file_name=nome_arquivo,
+                mime=mime
+            )
     else:
-        st.info("Nenhum participante cadastrado ainda.")
\ No newline at end of file
+        st.info("Nenhum participante encontrado com os filtros selecionados.")
+
+    apostas_duplicadas()
+
+def conciliacao_extrato():
+    with st.expander("🏦 Conciliar extrato bancário"):
+        st.caption(
+            "Envie o extrato (CSV/XLSX) com as colunas **nome** (ou pagador) e **valor**. "
+            "Participantes pendentes são encontrados pelo nome; o valor desempata homônimos "
+            "ou, sem nome correspondente, identifica quem pagou um valor único."
+        )
+        arquivo = st.file_uploader("Extrato", type=["csv", "xlsx"], key="extrato_bancario")
+        if arquivo is None:
+            st.session_state.pop('conciliacao', None)
+            return
+        
+        if st.button("🔍 Conferir extrato"):
+            from services.importacao import conciliar_extrato
+            
+            with st.spinner("Conciliando pagamentos..."):
+                st.session_state.conciliacao = conciliar_extrato(arquivo, arquivo.name)
+        
+        conciliacao = st.session_state.get('conciliacao')
+        if not conciliacao:
+            return
+        
+        conciliados = conciliacao['conciliados']
+        if conciliados:
+            st.markdown(f"**{len(conciliados)} pagamentos identificados**")
+            st.dataframe(pd.DataFrame(conciliados), use_container_width=True, hide_index=True)
+            if st.button(f"✅ Marcar {len(conciliados)} como pagos", type="primary"):
+                alterados = ParticipanteService.atualizar_status_em_lote(
+                    [linha['id'] for linha in conciliados], "Pago"
+                )
+                st.session_state.pop('conciliacao', None)
+                st.success(f"{alterados} participante(s) marcados como pagos")
+                st.rerun()
+        else:
+            st.info("Nenhum pagamento do extrato corresponde a um participante pendente.")
+        
+        if conciliacao['ambiguos']:
+            st.warning(f"{len(conciliacao['ambiguos'])} linhas com mais de um participante possível:")
+            st.dataframe(pd.DataFrame(conciliacao['ambiguos']), use_container_width=True, hide_index=True)
+        if conciliacao['nao_encontrados']:
+            st.warning(f"{len(conciliacao['nao_encontrados'])} linhas sem participante correspondente:")
+            st.dataframe(pd.DataFrame(conciliacao['nao_encontrados']), use_container_width=True, hide_index=True)
+
+def apostas_duplicadas():
+    with st.expander("🧬 Apostas idênticas e semelhantes"):
+        st.caption("Apostas idênticas e pares de apostas com 5 ou mais números em comum.")
+        if not st.button("🔍 Analisar apostas"):
+            return
+
+        with st.spinner("Procurando apostas repetidas..."):
+            relatorio = ParticipanteService.relatorio_apostas_duplicadas()
+
+        if relatorio['identicas']:
+            st.markdown(f"**{len(relatorio['identicas'])} apostas cadastradas mais de uma vez**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Números': ', '.join(f"{n:02d}" for n in grupo['numeros']),
+                    'Vezes': len(grupo['participantes']),
+                    'Participantes': ', '.join(grupo['participantes'])
+                }
+                for grupo in relatorio['identicas']
+            ]), use_container_width=True, hide_index=True)
+        else:
+            st.success("Nenhuma aposta idêntica encontrada")
+
+        if relatorio['semelhantes']:
+            st.markdown(f"**{relatorio['total_semelhantes']} pares de apostas semelhantes**")
+            if relatorio['total_semelhantes'] > len(relatorio['semelhantes']):
+                st.caption(
+                    f"Lista limitada aos {len(relatorio['semelhantes'])} pares com mais números em comum."
+                )
+            st.dataframe(pd.DataFrame([
+                {
+                    'Participante A': par['participante_a'],
+                    'Números A': ', '.join(f"{n:02d}" for n in par['numeros_a']),
+                    'Participante B': par['participante_b'],
+                    'Números B': ', '.join(f"{n:02d}" for n in par['numeros_b']),
+                    'Em comum': par['compartilhados']
+                }
+                for par in relatorio['semelhantes']
+            ]), use_container_width=True, hide_index=True)
+        else:
+            st.success("Nenhum par de apostas semelhantes encontrado")
@@ -1,8 +1,147 @@
 import streamlit as st
 import pandas as pd
 from services.participante_service import ParticipanteService
+from services.concurso_service import ConcursoService
+from services.resultado_service import ResultadoService
+from html import escape
 import time
 
+PONTUADORES_POR_PAGINA = 25
+# Cor do placar pelo número de acertos
+CORES_ACERTOS = {
+    6: '#FFD700',  # Ouro
+    5: '#FFD700',
+    4: '#C0C0C0',  # Prata
+    3: '#CD7F32'   # Bronze
+}
+
+def _premios_texto(pontuador):
+    # Apostas estendidas (7 a 15 números) valem vários jogos: mostra os prêmios de cada faixa
+    if len(pontuador['numeros']) <= 6:
+        return ""
+    return (
+        f"<br>🏅 {pontuador['senas']} sena(s) · {pontuador['quinas']} quina(s) · "
+        f"{pontuador['quadras']} quadra(s)"
+    )
+
+def _tabela_pontuadores(pontuadores):
+    # Um único bloco HTML por página, independente de quantas apostas pontuaram
+    linhas = ''.join(
+        f"""<tr style='background-color: {CORES_ACERTOS.get(p['acertos'], '#FFFFFF')}; color: #000;'>
+            <td style='padding: 8px;'><b>{escape(p['nome'])}</b></td>
+            <td style='padding: 8px;'>{', '.join(f"{n:02d}" for n in p['numeros'])}{_premios_texto(p)}</td>
+            <td style='padding: 8px; text-align: center;'>✨ {p['acertos']} ✨</td>
+        </tr>"""
+        for p in pontuadores
+    )
+    return f"""
+        <table style='width: 100%; border-collapse: separate; border-spacing: 0 6px;'>
+            <thead><tr><th>Nome</th><th>Números</th><th>Acertos</th></tr></thead>
+            <tbody>{linhas}</tbody>
+        </table>
+    """
+
+def _exibir_resultados(resultados, numeros_sorteados, celebrar):
+    if resultados.get('calculado_em'):
+        st.caption(f"Resultado calculado em {resultados['calculado_em']}")
+    
+    # Se houver ganhadores
+    if resultados['ganhadores']:
+        # Efeito de celebração (só quando o resultado acaba de sair)
+        if celebrar:
+            st.balloons()  # Solta balões
+
+        # Mensagem com efeito
+        st.markdown("""
+            <div style='padding: 20px; background: linear-gradient(45deg, #FFD700, #FFA500); 
+                    border-radius: 10px; text-align: center; animation: pulse 2s infinite;'>
+                <h2 style='color: #fff; text-shadow: 2px 2px 4px #000;'>
+                    🎉 TEMOS GANHADORES! 🎉
+                </h2>
+            </div>
+            <style>
+                @keyframes pulse {
+                    0% { transform: scale(1); }
+                    50% { transform: scale(1.05); }
+                    100% { transform: scale(1); }
+                }
+            </style>
+        """, unsafe_allow_html=True)
+    else:
+        st.warning("😔 Não tivemos ganhadores com 6 acertos")
+
+    # Contagem completa por faixa, mesmo além do placar exibido
+    por_acertos = resultados.get('por_acertos')
+    if por_acertos:
+        colunas = st.columns(4)
+        for acertos, rotulo, coluna in zip((6, 5, 4, 3), ("Senas", "Quinas", "Quadras", "Ternos"), colunas):
+            coluna.metric(rotulo, por_acertos[acertos])
+
+    # Placar paginado: ganhadores aparecem primeiro, já que a lista vem ordenada por acertos
+    pontuadores = resultados['maiores_pontuadores']
+    if pontuadores:
+        st.subheader("🏆 Ganhadores e maiores pontuadores" if resultados['ganhadores'] else "🎯 Maiores Pontuadores:")
+        total_paginas = -(-len(pontuadores) // PONTUADORES_POR_PAGINA)
+        pagina = 1
+        if total_paginas > 1:
+            pagina = st.number_input(
+                f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, value=1,
+                key="resultado_pagina"
+            )
+        inicio = (pagina - 1) * PONTUADORES_POR_PAGINA
+        st.markdown(
+            _tabela_pontuadores(pontuadores[inicio:inicio + PONTUADORES_POR_PAGINA]),
+            unsafe_allow_html=True
+        )
+        if por_acertos and sum(por_acertos[3:]) > len(pontuadores):
+            st.caption(f"Exibindo os {len(pontuadores)} melhores de {sum(por_acertos[3:])} apostas premiadas.")
+
+    # Exibir números sorteados (todas as bolas num único bloco)
+    bolas = ''.join(
+        f"""<div style='background-color: white; color: #4CAF50; width: 40px; height: 40px; 
+                border-radius: 50%; display: flex; align-items: center; justify-content: center; 
+                font-weight: bold; font-size: 20px;'>{num:02d}</div>"""
+        for num in sorted(numeros_sorteados)
+    )
+    st.markdown(f"""
+        <div style='background-color: #4CAF50; padding: 15px; border-radius: 8px; 
+                margin: 20px 0; text-align: center;'>
+            <h3 style='color: white; margin: 0;'>Números Sorteados:</h3>
+            <div style='display: flex; justify-content: center; gap: 10px; margin-top: 10px;'>{bolas}</div>
+        </div>
+    """, unsafe_allow_html=True)
+
+def _acompanhamento_ao_vivo(numeros_sorteados):
+    # O placar fica na sessão e só recomeça se os participantes mudarem; cada bola nova
+    # atualiza apenas as apostas que contêm o número
+    versao = ParticipanteService.obter_versao_dados()
+    estado = st.session_state.get('placar_ao_vivo')
+    if estado is None or estado[0] != versao:
+        estado = st.session_state.placar_ao_vivo = ParticipanteService.iniciar_placar(top_k=10)
+    _, ids, placar = estado
+    placar.sincronizar(numeros_sorteados)
+    
+    if not numeros_sorteados:
+        st.caption("Escolha as bolas na ordem do sorteio para acompanhar o placar.")
+        return
+    
+    st.markdown(f"**Placar após {len(numeros_sorteados)} bola(s)**")
+    colunas = st.columns(6)
+    for acertos, coluna in zip(range(1, 7), colunas):
+        coluna.metric(f"{acertos} acerto(s)", int(placar.por_acertos[acertos]))
+    
+    resultados = ParticipanteService.resultados_placar(ids, placar)
+    if resultados['maiores_pontuadores']:
+        st.dataframe(pd.DataFrame([
+            {
+                'Nome': pontuador['nome'],
+                'Números': ', '.join(f"{n:02d}" for n in pontuador['numeros']),
+                'Acertos': pontuador['acertos']
+            }
+            for pontuador in resultados['maiores_pontuadores']
+            if pontuador['acertos']
+        ]), use_container_width=True, hide_index=True)
+
 def app():    
     # Input dos números sorteados
     st.subheader("Digite os números sorteados")
@@ -15,95 +154,167 @@ def app():
         max_selections=6
     )
     
+    if st.toggle("📡 Acompanhar ao vivo", help="Atualiza o placar a cada bola, antes de completar as 6"):
+        _acompanhamento_ao_vivo(numeros_sorteados)
+    
     if len(numeros_sorteados) == 6:
+        # Guardar o sorteio no histórico de concursos
+        col_concurso, col_salvar = st.columns([3, 1])
+        with col_concurso:
+            numero_concurso = st.number_input("Número do concurso", min_value=1, step=1, value=None)
+        with col_salvar:
+            if st.button("💾 Salvar no histórico", disabled=numero_concurso is None):
+                if ConcursoService.adicionar_concurso(int(numero_concurso), numeros_sorteados):
+                    st.success(f"Concurso {int(numero_concurso)} salvo no histórico!")
+                else:
+                    st.error("Esse concurso já está no histórico")
+        
+        suspense = st.checkbox("Criar suspense", help="Segura o resultado por 2 segundos antes de exibir")
         if st.button("🎲 Verificar Resultados", type="primary"):
             # Efeito de loading
             with st.spinner("Verificando resultados..."):
-                time.sleep(2)  # Criar suspense
-                
-                # Buscar resultados
-                resultados = ParticipanteService.verificar_resultados(numeros_sorteados)
-                
-                # Se houver ganhadores
-                if resultados['ganhadores']:
-                    # Efeito de celebração
-                    st.balloons()  # Solta balões
-                    
-                    # Mensagem com efeito
-                    st.markdown("""
-                        <div style='padding: 20px; background: linear-gradient(45deg, #FFD700, #FFA500); 
-                                border-radius: 10px; text-align: center; animation: pulse 2s infinite;'>
-                            <h2 style='color: #fff; text-shadow: 2px 2px 4px #000;'>
-                                🎉 TEMOS GANHADORES! 🎉
-                            </h2>
-                        </div>
-                        <style>
-                            @keyframes pulse {
-                                0% { transform: scale(1); }
-                                50% { transform: scale(1.05); }
-                                100% { transform: scale(1); }
-                            }
-                        </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # Lista de ganhadores
-                    st.markdown("### 🏆 Ganhadores:")
-                    for ganhador in resultados['ganhadores']:
-                        st.markdown(f"""
-                            <div style='background-color: #FFD700; padding: 15px; 
-                                    border-radius: 8px; margin: 10px 0;'>
-                                <h3 style='margin:0; color: #000;'>
-                                    {ganhador['nome']} 
-                                    <span style='float:right'>✨ {ganhador['acertos']} acertos ✨</span>
-                                </h3>
-                                <p style='margin:5px 0 0 0;'>Números: {', '.join(f"{n:02d}" for n in ganhador['numeros'])}</p>
-                            </div>
-                        """, unsafe_allow_html=True)
-                
-                # Se não houver ganhadores, mostrar maiores pontuadores
-                else:
-                    st.warning("😔 Não tivemos ganhadores com 6 acertos")
-                    
-                    # Mostrar maiores pontuadores
-                    st.subheader("🎯 Maiores Pontuadores:")
-                    for pontuador in resultados['maiores_pontuadores']:
-                        # Cor baseada no número de acertos
-                        cor = {
-                            5: '#FFD700',  # Ouro
-                            4: '#C0C0C0',  # Prata
-                            3: '#CD7F32'   # Bronze
-                        }.get(pontuador['acertos'], '#FFFFFF')
-                        
-                        st.markdown(f"""
-                            <div style='background-color: {cor}; padding: 15px; 
-                                    border-radius: 8px; margin: 10px 0; opacity: 0.9;'>
-                                <h3 style='margin:0; color: #000;'>
-                                    {pontuador['nome']} 
-                                    <span style='float:right'>✨ {pontuador['acertos']} acertos ✨</span>
-                                </h3>
-                                <p style='margin:5px 0 0 0;'>
-                                    Números: {', '.join(f"{n:02d}" for n in pontuador['numeros'])}
-                                </p>
-                            </div>
-                        """, unsafe_allow_html=True)
-                
-                # Exibir números sorteados
-                st.markdown("""
-                    <div style='background-color: #4CAF50; padding: 15px; border-radius: 8px; 
-                            margin: 20px 0; text-align: center;'>
-                        <h3 style='color: white; margin: 0;'>Números Sorteados:</h3>
-                        <div style='display: flex; justify-content: center; gap: 10px; margin-top: 10px;'>
-                """, unsafe_allow_html=True)
-                
-                for num in sorted(numeros_sorteados):
-                    st.markdown(f"""
-                        <div style='background-color: white; color: #4CAF50; width: 40px; height: 40px; 
-                                border-radius: 50%; display: flex; align-items: center; justify-content: center; 
-                                font-weight: bold; font-size: 20px;'>
-                            {num:02d}
-                        </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("</div></div>", unsafe_allow_html=True)
+                # Buscar resultados (do snapshot salvo, se as apostas não mudaram)
+                resultados = ResultadoService.verificar_resultados(numeros_sorteados)
+                if suspense:
+                    time.sleep(2)  # só efeito visual; a pontuação já terminou
+            _exibir_resultados(resultados, numeros_sorteados, celebrar=True)
+        else:
+            # Sorteio já verificado: o resultado salvo continua na tela entre as interações
+            resultados = ResultadoService.obter_snapshot(numeros_sorteados)
+            if resultados is not None:
+                _exibir_resultados(resultados, numeros_sorteados, celebrar=False)
     else:
-        st.info("Selecione os 6 números sorteados para verificar os resultados") 
\ No newline at end of file
+        st.info("Selecione os 6 números sorteados para verificar os resultados")
+    
+    simulacao()
+    historico()
+
+def _ler_sorteios_texto(texto):
+    sorteios = []
+    for numero_linha, linha in enumerate(texto.splitlines(), start=1):
+        partes = [p for p in linha.replace(',', ' ').replace(';', ' ').replace('-', ' ').split() if p]
+        if not partes:
+            continue
+        numeros = [int(p) for p in partes if p.isdigit()]
+        if len(partes) != 6 or len(set(numeros)) != 6 or any(not 1 <= n <= 60 for n in numeros):
+            raise ValueError(f"Linha {numero_linha}: informe 6 números distintos entre 1 e 60")
+        sorteios.append(sorted(numeros))
+    return sorteios
+
+def simulacao():
+    with st.expander("🔮 Simular vários sorteios"):
+        st.caption(
+            "Pontua o bolão inteiro contra sorteios hipotéticos (um por linha) "
+            "ou contra um histórico de resultados em CSV/XLSX."
+        )
+        texto = st.text_area("Sorteios (6 números por linha)", placeholder="04 08 15 16 23 42")
+        arquivo = st.file_uploader("Ou carregue um histórico de sorteios", type=["csv", "xlsx"], key="sorteios_simulacao")
+        top_k = st.number_input("Maiores pontuadores por sorteio", min_value=1, max_value=20, value=3)
+        
+        if st.button("🔮 Simular"):
+            try:
+                sorteios = _ler_sorteios_texto(texto)
+            except ValueError as e:
+                st.error(str(e))
+                return
+            rotulos = [' '.join(f"{n:02d}" for n in s) for s in sorteios]
+            
+            if arquivo is not None:
+                from services.importacao import ler_sorteios_planilha
+                
+                sorteios_arquivo, erros = ler_sorteios_planilha(arquivo, arquivo.name)
+                if erros:
+                    st.warning(f"{len(erros)} linhas do arquivo foram ignoradas")
+                sorteios.extend(s['numeros'] for s in sorteios_arquivo)
+                rotulos.extend(
+                    f"Concurso {s['concurso']}" if s['concurso'] else ' '.join(f"{n:02d}" for n in s['numeros'])
+                    for s in sorteios_arquivo
+                )
+            
+            if not sorteios:
+                st.info("Informe ao menos um sorteio para simular")
+                return
+            
+            with st.spinner(f"Pontuando {len(sorteios)} sorteios..."):
+                resultado = ParticipanteService.simular_sorteios(sorteios, top_k=int(top_k))
+            
+            st.markdown("**Apostas por quantidade de acertos**")
+            df_histograma = pd.DataFrame(
+                resultado['histograma'],
+                columns=[f"{i} acertos" for i in range(7)],
+                index=rotulos
+            )
+            st.dataframe(df_histograma, use_container_width=True)
+            
+            st.markdown("**Maiores pontuadores por sorteio**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Sorteio': rotulo,
+                    'Nome': pontuador['nome'],
+                    'Números': ', '.join(f"{n:02d}" for n in pontuador['numeros']),
+                    'Acertos': pontuador['acertos']
+                }
+                for rotulo, pontuadores in zip(rotulos, resultado['maiores_pontuadores'])
+                for pontuador in pontuadores
+            ]), use_container_width=True, hide_index=True)
+
+def historico():
+    with st.expander("📚 Histórico de concursos e backtest"):
+        contagem = ConcursoService.contar_concursos()
+        st.caption(
+            f"{contagem['total']} concursos no histórico, "
+            f"{contagem['processados']} já pontuados no backtest."
+        )
+        
+        arquivo = st.file_uploader(
+            "Carregar resultados oficiais (CSV/XLSX com concurso, data e as 6 dezenas)",
+            type=["csv", "xlsx"],
+            key="historico_concursos"
+        )
+        if arquivo is not None and st.button("📥 Importar concursos"):
+            from services.importacao import ler_sorteios_planilha
+            
+            sorteios, erros = ler_sorteios_planilha(arquivo, arquivo.name)
+            resultado = ConcursoService.importar_concursos(sorteios)
+            if resultado.get('erro_geral'):
+                st.error(f"Erro ao importar concursos: {resultado['erro_geral']}")
+            else:
+                st.success(
+                    f"{resultado['inseridos']} concursos importados "
+                    f"({resultado['ignorados']} já existiam)"
+                )
+            if erros:
+                st.warning(f"{len(erros)} linhas do arquivo foram ignoradas")
+        
+        if st.button("📈 Executar backtest", disabled=contagem['total'] == 0):
+            with st.spinner("Pontuando apostas contra o histórico..."):
+                resultado = ConcursoService.executar_backtest()
+            st.success(
+                f"Backtest atualizado: {resultado['concursos_pontuados']} concursos novos e "
+                f"{resultado['apostas_pontuadas']} apostas novas pontuadas"
+            )
+        
+        if ConcursoService.contar_concursos()['processados']:
+            st.markdown("**Melhores apostas no histórico**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Nome': aposta['nome'],
+                    'Números': ', '.join(f"{n:02d}" for n in aposta['numeros']),
+                    'Senas': aposta['senas'],
+                    'Quinas': aposta['quinas'],
+                    'Quadras': aposta['quadras'],
+                    'Ternos': aposta['acertos'][3]
+                }
+                for aposta in ConcursoService.estatisticas_backtest_apostas(limite=20)
+            ]), use_container_width=True, hide_index=True)
+            
+            st.markdown("**Acertos por número**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Número': f"{estatistica['numero']:02d}",
+                    'Vezes sorteado': estatistica['vezes_sorteado'],
+                    'Apostas com o número': estatistica['apostas_com_numero'],
+                    'Acertos gerados': estatistica['acertos_gerados']
+                }
+                for estatistica in ConcursoService.estatisticas_backtest_numeros()
+            ]), use_container_width=True, hide_index=True)
@@ -0,0 +1,68 @@
+from typing import Optional
+import numpy as np
+from services.pontuacao import _POSICOES_BITS, _subconjuntos
+
+# Linhas da matriz de apostas multiplicadas de uma vez (limita a memória do produto)
+LINHAS_POR_BLOCO = 200_000
+
+
+def matriz_apostas(apostas_bitmask) -> np.ndarray:
+    # Matriz N x 60 com 1 onde a aposta contém o número (coluna 0 = número 1)
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    return ((apostas[:, None] >> _POSICOES_BITS) & np.uint64(1)).astype(np.uint8)
+
+
+def frequencia_numeros(apostas_bitmask) -> np.ndarray:
+    # Quantas apostas escolheram cada número: bincount das posições dos bits ligados
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    frequencia = np.zeros(60, dtype=np.int64)
+    for inicio in range(0, apostas.size, LINHAS_POR_BLOCO):
+        bits = matriz_apostas(apostas[inicio:inicio + LINHAS_POR_BLOCO])
+        frequencia += np.bincount(np.nonzero(bits)[1], minlength=60)
+    return frequencia
+
+
+def coocorrencia_pares(apostas_bitmask) -> np.ndarray:
+    """Matriz 60 x 60 com o número de apostas que contêm cada par de números.
+
+    É o produto X.T @ X da matriz de apostas, feito em float32 por blocos (exato
+    enquanto cada bloco tiver menos de 2**24 linhas). A diagonal é a frequência
+    de cada número.
+    """
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    matriz = np.zeros((60, 60), dtype=np.int64)
+    for inicio in range(0, apostas.size, LINHAS_POR_BLOCO):
+        bits = matriz_apostas(apostas[inicio:inicio + LINHAS_POR_BLOCO]).astype(np.float32)
+        matriz += np.rint(bits.T @ bits).astype(np.int64)
+    return matriz
+
+
+def contagem_trios(apostas_bitmask, minimo: int = 2):
+    """Trios de números presentes em pelo menos `minimo` apostas, em forma esparsa.
+
+    Dos 34.220 trios possíveis, só os que aparecem em alguma aposta são gerados
+    (20 por aposta simples, até 455 numa de 15 números). Retorna (bitmasks dos
+    trios, apostas que contêm cada um), do mais frequente para o menos.
+    """
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    chaves, _ = _subconjuntos(apostas, 3)
+    trios, contagens = np.unique(chaves, return_counts=True)
+    manter = contagens >= minimo
+    trios, contagens = trios[manter], contagens[manter]
+    ordem = np.argsort(-contagens, kind='stable')
+    return trios[ordem], contagens[ordem]
+
+
+def sobre_representacao(observado, frequencia, total_apostas: int, bitmasks: Optional[np.ndarray] = None):
+    # Razão observado / esperado se os números fossem escolhidos de forma independente:
+    # para um par, freq(a) * freq(b) / N; para um trio, freq(a) * freq(b) * freq(c) / N²
+    frequencia = np.asarray(frequencia, dtype=np.float64)
+    if total_apostas == 0:
+        return np.zeros_like(np.asarray(observado, dtype=np.float64))
+    if bitmasks is None:
+        esperado = np.outer(frequencia, frequencia) / total_apostas
+    else:
+        bits = matriz_apostas(bitmasks).astype(bool)
+        esperado = np.prod(np.where(bits, frequencia, 1.0), axis=1) / total_apostas ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(esperado > 0, np.asarray(observado) / esperado, 0.0)
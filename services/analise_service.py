@@ -0,0 +1,145 @@
+from typing import List
+from models.participante import bitmask_para_numeros
+from services.analise import (
+    contagem_trios,
+    coocorrencia_pares,
+    frequencia_numeros,
+    sobre_representacao
+)
+from services.cache import CacheVersionado
+from services.participante_service import ParticipanteService
+from services.sugestao import EstadoCobertura
+from config import database
+from config.database import get_db
+from config.monitoramento import instrumentar
+import numpy as np
+import threading
+
+# Cobertura do bolão para as sugestões, por banco: (versão dos dados, EstadoCobertura)
+_estados_cobertura = {}
+_estados_lock = threading.Lock()
+# Threads que montam a cobertura antes da primeira sugestão, por banco
+_preparos = {}
+_preparos_lock = threading.Lock()
+
+@instrumentar
+class AnaliseService:
+    # Cada análise percorre todas as apostas; o resultado vale até a próxima escrita em participantes
+    _cache = CacheVersionado(tamanho_maximo=8)
+
+    @staticmethod
+    def _em_cache(chave, carregar):
+        versao = ParticipanteService.obter_versao_dados()
+        return AnaliseService._cache.obter(chave, versao, carregar)
+
+    @staticmethod
+    def estatisticas_cache() -> dict:
+        return AnaliseService._cache.estatisticas()
+
+    @staticmethod
+    def cobertura_numeros() -> dict:
+        def carregar():
+            _, apostas = ParticipanteService.carregar_apostas()
+            frequencia = frequencia_numeros(apostas)
+            ordem = np.argsort(-frequencia, kind='stable')
+            return {
+                'total_apostas': int(apostas.size),
+                'frequencia': frequencia.tolist(),
+                'numeros_cobertos': int(np.count_nonzero(frequencia)),
+                'nao_escolhidos': (np.flatnonzero(frequencia == 0) + 1).tolist(),
+                'mais_escolhidos': (ordem[:10] + 1).tolist(),
+                'menos_escolhidos': (ordem[::-1][:10] + 1).tolist()
+            }
+        return AnaliseService._em_cache('cobertura_numeros', carregar)
+
+    @staticmethod
+    def coocorrencia() -> dict:
+        # Matriz de pares (apostas com os dois números) e a razão sobre o esperado ao acaso
+        def carregar():
+            _, apostas = ParticipanteService.carregar_apostas()
+            pares = coocorrencia_pares(apostas)
+            frequencia = np.diag(pares)
+            razao = sobre_representacao(pares, frequencia, apostas.size)
+            np.fill_diagonal(razao, 0.0)
+            return {'total_apostas': int(apostas.size), 'pares': pares, 'razao': razao}
+        return AnaliseService._em_cache('coocorrencia', carregar)
+
+    @staticmethod
+    def pares_frequentes(limite: int = 20, minimo: int = 2) -> List[dict]:
+        analise = AnaliseService.coocorrencia()
+        pares, razao = analise['pares'], analise['razao']
+        linhas, colunas = np.triu_indices(60, k=1)
+        contagens = pares[linhas, colunas]
+        candidatos = np.flatnonzero(contagens >= minimo)
+        ordem = candidatos[np.lexsort((-razao[linhas, colunas][candidatos], -contagens[candidatos]))][:limite]
+        return [
+            {
+                'numeros': [int(linhas[i]) + 1, int(colunas[i]) + 1],
+                'apostas': int(contagens[i]),
+                'razao': float(razao[linhas[i], colunas[i]])
+            }
+            for i in ordem
+        ]
+
+    @staticmethod
+    def trios_frequentes(limite: int = 20, minimo: int = 2) -> List[dict]:
+        # Mais caro que os pares (20 trios por aposta simples); calculado só quando pedido
+        def carregar():
+            _, apostas = ParticipanteService.carregar_apostas()
+            trios, contagens = contagem_trios(apostas, minimo)
+            frequencia = np.asarray(AnaliseService.cobertura_numeros()['frequencia'])
+            return trios, contagens, sobre_representacao(contagens, frequencia, apostas.size, trios)
+
+        trios, contagens, razao = AnaliseService._em_cache(('trios', minimo), carregar)
+        return [
+            {'numeros': bitmask_para_numeros(trio), 'apostas': int(contagem), 'razao': float(r)}
+            for trio, contagem, r in zip(trios[:limite], contagens[:limite], razao[:limite])
+        ]
+
+    @staticmethod
+    def _estado_cobertura() -> EstadoCobertura:
+        # Apostas só ganham números ao serem inseridas: basta somar as de id novo. Se o
+        # total não fechar (alguma foi removida), a cobertura é recalculada do zero
+        with _estados_lock:
+            versao = ParticipanteService.obter_versao_dados()
+            versao_estado, estado = _estados_cobertura.get(database.DATABASE_PATH, (None, None))
+            if estado is not None and versao_estado == versao:
+                return estado
+
+            consulta = "SELECT id, numeros_bitmask FROM participantes WHERE id > ? ORDER BY id"
+            with get_db() as conn:
+                total = conn.execute("SELECT COUNT(*) FROM participantes").fetchone()[0]
+                if estado is None or estado.total_apostas > total:
+                    estado = EstadoCobertura()
+                rows = conn.execute(consulta, (estado.ultimo_id,)).fetchall()
+                if estado.total_apostas + len(rows) != total:
+                    estado = EstadoCobertura()
+                    rows = conn.execute(consulta, (0,)).fetchall()
+            if rows:
+                estado.adicionar(
+                    np.fromiter((row[1] for row in rows), dtype=np.uint64, count=len(rows)),
+                    rows[-1][0]
+                )
+            _estados_cobertura[database.DATABASE_PATH] = (versao, estado)
+            return estado
+
+    @staticmethod
+    def preparar_sugestoes():
+        # Montar a cobertura do zero custa ~0,5 s com 100 mil apostas (a contagem das
+        # quadras); feito numa thread ao abrir o Cadastro, o clique em sugerir não espera.
+        # Com a cobertura em dia a thread só confere a versão dos dados
+        with _preparos_lock:
+            preparo = _preparos.get(database.DATABASE_PATH)
+            if preparo is not None and preparo.is_alive():
+                return
+            preparo = _preparos[database.DATABASE_PATH] = threading.Thread(
+                target=AnaliseService._estado_cobertura, name="cobertura-sugestoes", daemon=True
+            )
+            preparo.start()
+
+    @staticmethod
+    def sugerir_numeros(quantidade: int = 6, fixos=(), semente=None) -> dict:
+        # Aposta que cobre o máximo de pares e quadras que o bolão ainda não tem
+        estado = AnaliseService._estado_cobertura()
+        numeros = estado.sugerir(max(quantidade, len(fixos)), fixos, semente)
+        return {'numeros': numeros, **estado.avaliar(numeros)}
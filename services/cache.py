@@ -0,0 +1,50 @@
+from collections import OrderedDict
+import threading
+
+
+class CacheVersionado:
+    """Cache LRU de leituras, válido enquanto a versão dos dados não mudar."""
+
+    def __init__(self, tamanho_maximo: int = 32):
+        self.tamanho_maximo = tamanho_maximo
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def obter(self, chave, versao: int, carregar):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] == versao:
+                self._itens.move_to_end(chave)
+                self._hits += 1
+                return item[1]
+            self._misses += 1
+        
+        # Carrega fora do lock para não bloquear leituras de outras chaves
+        valor = carregar()
+        
+        with self._lock:
+            self._itens[chave] = (versao, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+        return valor
+
+    def invalidar(self, chave=None):
+        with self._lock:
+            if chave is None:
+                self._itens.clear()
+            else:
+                self._itens.pop(chave, None)
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo,
+                'hits': self._hits,
+                'misses': self._misses,
+                'taxa_hit': self._hits / total if total else 0.0
+            }
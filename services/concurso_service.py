@@ -0,0 +1,244 @@
+from typing import Iterable, List, Optional
+from models.participante import numeros_para_bitmask, bitmask_para_numeros
+from config.database import get_db, get_escritor
+from services.participante_service import ParticipanteService
+from services.pontuacao import histograma_por_aposta
+import numpy as np
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ConcursoService:
+    # Concursos pontuados por transação; cada bloco confirmado é um ponto de retomada
+    CONCURSOS_POR_BLOCO = 250
+    # Apostas novas pontuadas contra o histórico por transação
+    APOSTAS_POR_BLOCO = 20000
+
+    @staticmethod
+    def importar_concursos(sorteios: Iterable[dict]) -> dict:
+        # sorteios: dicts com 'concurso', 'numeros' e opcionalmente 'data'
+        linhas = [
+            (
+                int(sorteio['concurso']),
+                sorteio.get('data'),
+                ','.join(map(str, sorted(sorteio['numeros']))),
+                numeros_para_bitmask(sorteio['numeros'])
+            )
+            for sorteio in sorteios
+            if sorteio.get('concurso') is not None
+        ]
+        def inserir(conn):
+            antes = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO concursos (
+                    concurso,
+                    data_sorteio,
+                    numeros_sorteados,
+                    numeros_bitmask
+                )
+                VALUES (?, ?, ?, ?)
+                """,
+                linhas
+            )
+            return conn.total_changes - antes
+
+        try:
+            inseridos = get_escritor().executar(inserir)
+        except Exception as e:
+            logger.exception("Erro ao importar concursos")
+            return {'inseridos': 0, 'ignorados': len(linhas), 'erro_geral': str(e)}
+
+        return {'inseridos': inseridos, 'ignorados': len(linhas) - inseridos}
+
+    @staticmethod
+    def adicionar_concurso(concurso: int, numeros: List[int], data_sorteio: Optional[str] = None) -> bool:
+        resultado = ConcursoService.importar_concursos(
+            [{'concurso': concurso, 'numeros': numeros, 'data': data_sorteio}]
+        )
+        return resultado['inseridos'] == 1
+
+    @staticmethod
+    def contar_concursos() -> dict:
+        with get_db() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(backtest_processado), 0), MAX(concurso)
+                FROM concursos
+            """).fetchone()
+        return {'total': row[0], 'processados': row[1], 'ultimo_concurso': row[2]}
+
+    @staticmethod
+    def listar_concursos(limite: int = 20) -> List[dict]:
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT concurso, data_sorteio, numeros_bitmask
+                FROM concursos
+                ORDER BY concurso DESC
+                LIMIT ?
+            """, (limite,)).fetchall()
+        return [
+            {'concurso': row[0], 'data': row[1], 'numeros': bitmask_para_numeros(row[2])}
+            for row in rows
+        ]
+
+    @staticmethod
+    def executar_backtest(processos: Optional[int] = None) -> dict:
+        # Incremental e retomável: só pontua apostas sem linha em backtest_apostas
+        # (contra os concursos já processados) e concursos ainda não processados
+        # (contra todas as apostas). Cada bloco é confirmado numa transação própria
+        # do escritor único; a pontuação em si roda fora dele, sobre a conexão de leitura.
+        ids, apostas = ParticipanteService.carregar_apostas()
+        apostas_pontuadas = 0
+        concursos_pontuados = 0
+        escritor = get_escritor()
+
+        escritor.executar(lambda conn: conn.execute("""
+            DELETE FROM backtest_apostas
+            WHERE participante_id NOT IN (SELECT id FROM participantes)
+        """))
+
+        with get_db() as conn:
+            ja_pontuadas = np.fromiter(
+                (row[0] for row in conn.execute("SELECT participante_id FROM backtest_apostas")),
+                dtype=np.int64
+            )
+            sorteios_processados = np.fromiter(
+                (row[0] for row in conn.execute(
+                    "SELECT numeros_bitmask FROM concursos WHERE backtest_processado = 1"
+                )),
+                dtype=np.uint64
+            )
+
+            # 1) Apostas novas contra o histórico já processado
+            novas = np.flatnonzero(~np.isin(ids, ja_pontuadas))
+            for inicio in range(0, novas.size, ConcursoService.APOSTAS_POR_BLOCO):
+                bloco = novas[inicio:inicio + ConcursoService.APOSTAS_POR_BLOCO]
+                histograma = histograma_por_aposta(apostas[bloco], sorteios_processados, processos)
+                linhas = [
+                    (int(participante_id), *map(int, linha))
+                    for participante_id, linha in zip(ids[bloco], histograma)
+                ]
+                escritor.executar(lambda conn, linhas=linhas: conn.executemany(
+                    """
+                    INSERT INTO backtest_apostas (
+                        participante_id,
+                        acertos_0, acertos_1, acertos_2, acertos_3,
+                        acertos_4, acertos_5, acertos_6
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    linhas
+                ))
+                apostas_pontuadas += bloco.size
+
+            # 2) Concursos pendentes contra todas as apostas
+            while True:
+                pendentes = conn.execute("""
+                    SELECT concurso, numeros_bitmask
+                    FROM concursos
+                    WHERE backtest_processado = 0
+                    ORDER BY concurso
+                    LIMIT ?
+                """, (ConcursoService.CONCURSOS_POR_BLOCO,)).fetchall()
+                if not pendentes:
+                    break
+
+                sorteios = np.fromiter((row[1] for row in pendentes), dtype=np.uint64, count=len(pendentes))
+                histograma = histograma_por_aposta(apostas, sorteios, processos)
+                linhas = [
+                    (*map(int, linha), int(participante_id))
+                    for participante_id, linha in zip(ids, histograma)
+                ]
+                concursos = json.dumps([row[0] for row in pendentes])
+                escritor.executar(
+                    lambda conn, linhas=linhas, concursos=concursos:
+                        ConcursoService._somar_acertos(conn, linhas, concursos)
+                )
+                concursos_pontuados += len(pendentes)
+
+        return {
+            'apostas_pontuadas': apostas_pontuadas,
+            'concursos_pontuados': concursos_pontuados
+        }
+
+    @staticmethod
+    def _somar_acertos(conn, linhas, concursos: str):
+        conn.executemany(
+            """
+            UPDATE backtest_apostas SET
+                acertos_0 = acertos_0 + ?,
+                acertos_1 = acertos_1 + ?,
+                acertos_2 = acertos_2 + ?,
+                acertos_3 = acertos_3 + ?,
+                acertos_4 = acertos_4 + ?,
+                acertos_5 = acertos_5 + ?,
+                acertos_6 = acertos_6 + ?
+            WHERE participante_id = ?
+            """,
+            linhas
+        )
+        conn.execute(
+            "UPDATE concursos SET backtest_processado = 1 WHERE concurso IN (SELECT value FROM json_each(?))",
+            (concursos,)
+        )
+
+    @staticmethod
+    def reiniciar_backtest():
+        def reiniciar(conn):
+            conn.execute("DELETE FROM backtest_apostas")
+            conn.execute("UPDATE concursos SET backtest_processado = 0")
+        get_escritor().executar(reiniciar)
+
+    @staticmethod
+    def estatisticas_backtest_apostas(limite: int = 50) -> List[dict]:
+        # Melhores apostas no histórico: mais senas, depois quinas, depois quadras
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT
+                    p.nome,
+                    p.numeros_bitmask,
+                    b.acertos_0, b.acertos_1, b.acertos_2, b.acertos_3,
+                    b.acertos_4, b.acertos_5, b.acertos_6
+                FROM backtest_apostas b
+                JOIN participantes p ON p.id = b.participante_id
+                ORDER BY b.acertos_6 DESC, b.acertos_5 DESC, b.acertos_4 DESC, b.acertos_3 DESC, p.id DESC
+                LIMIT ?
+            """, (limite,)).fetchall()
+        return [
+            {
+                'nome': row[0],
+                'numeros': bitmask_para_numeros(row[1]),
+                'acertos': list(row[2:9]),
+                'quadras': row[6],
+                'quinas': row[7],
+                'senas': row[8]
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def estatisticas_backtest_numeros() -> List[dict]:
+        # Por número: vezes sorteado no histórico, apostas que o contêm e
+        # total de acertos que ele gerou (vezes sorteado x apostas com o número)
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT
+                    n.numero,
+                    (SELECT COUNT(*) FROM concursos c
+                     WHERE c.backtest_processado = 1
+                       AND (c.numeros_bitmask >> (n.numero - 1)) & 1) AS vezes_sorteado,
+                    (SELECT COUNT(*) FROM participante_numeros pn
+                     WHERE pn.numero = n.numero) AS apostas_com_numero
+                FROM numeros_megasena n
+                ORDER BY n.numero
+            """).fetchall()
+        return [
+            {
+                'numero': row[0],
+                'vezes_sorteado': row[1],
+                'apostas_com_numero': row[2],
+                'acertos_gerados': row[1] * row[2]
+            }
+            for row in rows
+        ]
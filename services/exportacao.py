@@ -0,0 +1,143 @@
+import csv
+import io
+import tempfile
+from typing import BinaryIO, Iterator
+import numpy as np
+from config.database import get_db
+from services.participante_service import ParticipanteService
+
+CABECALHO_CSV = ['ID', 'Nome', 'Valor Pago', 'Números Escolhidos', 'Data Pagamento', 'Status']
+TAMANHO_BLOCO = 5000
+
+_POSICOES_BITS = np.arange(60, dtype=np.uint64)
+
+
+def _cursor_participantes(conn, **filtros):
+    condicoes, parametros = ParticipanteService._montar_filtros(**filtros)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return conn.execute(f"""
+        SELECT
+            id,
+            nome,
+            valor_pago,
+            numeros_bitmask,
+            datetime(data_pagamento, 'localtime') AS data_pagamento,
+            status_pagamento,
+            quantidade_cotas
+        FROM participantes
+        {where}
+        ORDER BY id DESC
+    """, parametros)
+
+
+def _numeros_por_linha(bitmasks: np.ndarray):
+    # Expande os bitmasks em (offsets, números) sem passar por listas Python
+    bits = ((bitmasks[:, None] >> _POSICOES_BITS) & np.uint64(1)).astype(bool)
+    linhas, colunas = np.nonzero(bits)
+    offsets = np.zeros(len(bitmasks) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(linhas, minlength=len(bitmasks)), out=offsets[1:])
+    return offsets, (colunas + 1).astype(np.int8)
+
+
+def exportar_csv(tamanho_bloco: int = TAMANHO_BLOCO, **filtros) -> Iterator[bytes]:
+    """Gera o CSV em blocos de bytes, lendo direto do cursor do SQLite."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(CABECALHO_CSV)
+    
+    with get_db() as conn:
+        cursor = _cursor_participantes(conn, **filtros)
+        while True:
+            rows = cursor.fetchmany(tamanho_bloco)
+            if not rows:
+                break
+            bitmasks = np.fromiter((row[3] for row in rows), dtype=np.uint64, count=len(rows))
+            offsets, numeros = _numeros_por_linha(bitmasks)
+            numeros = numeros.tolist()
+            escritor.writerows(
+                (
+                    row[0],
+                    row[1],
+                    f"R$ {row[2]:.2f}",
+                    ', '.join(f"{num:02d}" for num in numeros[offsets[i]:offsets[i + 1]]),
+                    row[4],
+                    row[5]
+                )
+                for i, row in enumerate(rows)
+            )
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iterar_lotes_arrow(tamanho_bloco: int = TAMANHO_BLOCO, **filtros):
+    """Gera RecordBatches do Arrow com colunas tipadas, bloco a bloco."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    esquema = schema_arrow()
+    with get_db() as conn:
+        cursor = _cursor_participantes(conn, **filtros)
+        while True:
+            rows = cursor.fetchmany(tamanho_bloco)
+            if not rows:
+                break
+            colunas = list(zip(*rows))
+            bitmasks = np.fromiter(colunas[3], dtype=np.uint64, count=len(rows))
+            offsets, numeros = _numeros_por_linha(bitmasks)
+            datas = pc.strptime(
+                pa.array(colunas[4], type=pa.string()),
+                format='%Y-%m-%d %H:%M:%S', unit='s', error_is_null=True
+            )
+            yield pa.RecordBatch.from_arrays(
+                [
+                    pa.array(colunas[0], type=pa.int64()),
+                    pa.array(colunas[1], type=pa.string()),
+                    pa.array(colunas[2], type=pa.float64()),
+                    pa.ListArray.from_arrays(pa.array(offsets), pa.array(numeros)),
+                    pa.array(bitmasks),
+                    datas,
+                    pa.array(colunas[5], type=pa.string()),
+                    pa.array(colunas[6], type=pa.int32()),
+                ],
+                schema=esquema
+            )
+
+
+def schema_arrow():
+    import pyarrow as pa
+    
+    return pa.schema([
+        ('id', pa.int64()),
+        ('nome', pa.string()),
+        ('valor_pago', pa.float64()),
+        ('numeros', pa.list_(pa.int8())),
+        ('numeros_bitmask', pa.uint64()),
+        ('data_pagamento', pa.timestamp('s')),
+        ('status_pagamento', pa.string()),
+        ('quantidade_cotas', pa.int32()),
+    ])
+
+
+def exportar_csv_em_arquivo(tamanho_bloco: int = TAMANHO_BLOCO, **filtros) -> BinaryIO:
+    """Grava os blocos do CSV num arquivo temporário e o devolve posicionado no início."""
+    destino = tempfile.TemporaryFile()
+    for bloco in exportar_csv(tamanho_bloco, **filtros):
+        destino.write(bloco)
+    destino.seek(0)
+    return destino
+
+
+def exportar_parquet(tamanho_bloco: int = TAMANHO_BLOCO, **filtros) -> BinaryIO:
+    """Grava o Parquet num arquivo temporário e o devolve posicionado no início."""
+    import pyarrow.parquet as pq
+    
+    destino = tempfile.TemporaryFile()
+    with pq.ParquetWriter(destino, schema_arrow(), compression='zstd') as escritor:
+        for lote in iterar_lotes_arrow(tamanho_bloco, **filtros):
+            escritor.write_batch(lote)
+    destino.seek(0)
+    return destino
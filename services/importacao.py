@@ -0,0 +1,253 @@
+import csv
+import io
+import re
+import unicodedata
+from array import array
+from typing import Iterator, Tuple
+from models.participante import Participante
+from services.participante_service import ParticipanteService
+
+# Nomes de coluna aceitos (já normalizados: minúsculos, sem acento)
+COLUNAS_NOME = ('nome', 'participante', 'name')
+COLUNAS_NUMEROS = ('numeros', 'numeros_escolhidos', 'dezenas', 'aposta')
+COLUNAS_STATUS = ('status', 'status_pagamento')
+COLUNAS_COTAS = ('cotas', 'quantidade_cotas')
+COLUNAS_VALOR = ('valor', 'valor_pago')
+COLUNAS_CONCURSO = ('concurso', 'numero_concurso', 'n_concurso')
+COLUNAS_DATA = ('data', 'data_sorteio', 'data_do_sorteio')
+# Extratos bancários: quem pagou e quanto
+COLUNAS_PAGADOR = COLUNAS_NOME + ('pagador', 'remetente', 'origem', 'depositante')
+COLUNAS_VALOR_EXTRATO = COLUNAS_VALOR + ('valor_recebido', 'credito', 'quantia', 'amount')
+
+_SEPARADORES_NUMEROS = re.compile(r'[\s,;/\-]+')
+_COLUNA_DEZENA = re.compile(r'^(?:n|num|numero|dezena|bola|d)_?(\d{1,2})$')
+
+
+def _normalizar_coluna(nome) -> str:
+    texto = unicodedata.normalize('NFKD', str(nome or '')).encode('ascii', 'ignore').decode()
+    return re.sub(r'\s+', '_', texto.strip().lower())
+
+
+def _ler_csv(arquivo) -> Iterator[list]:
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+    except csv.Error:
+        dialeto = csv.excel
+    try:
+        yield from csv.reader(texto, dialeto)
+    finally:
+        texto.detach()
+
+
+def _ler_xlsx(arquivo) -> Iterator[list]:
+    from openpyxl import load_workbook
+    
+    # read_only percorre as linhas sem carregar a planilha inteira na memória
+    planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        for linha in planilha.active.iter_rows(values_only=True):
+            yield ['' if valor is None else valor for valor in linha]
+    finally:
+        planilha.close()
+
+
+def ler_planilha(arquivo, nome_arquivo: str) -> Iterator[Tuple[int, dict]]:
+    """Percorre a planilha linha a linha, gerando (número da linha, {coluna: valor})."""
+    if nome_arquivo.lower().endswith('.xlsx'):
+        linhas = _ler_xlsx(arquivo)
+    else:
+        linhas = _ler_csv(arquivo)
+    
+    cabecalho = None
+    for numero_linha, linha in enumerate(linhas, start=1):
+        if cabecalho is None:
+            cabecalho = [_normalizar_coluna(coluna) for coluna in linha]
+            continue
+        if not any(str(valor).strip() for valor in linha):
+            continue
+        yield numero_linha, dict(zip(cabecalho, linha))
+
+
+def _primeiro(registro: dict, colunas) -> str:
+    for coluna in colunas:
+        valor = registro.get(coluna)
+        if valor is not None and str(valor).strip():
+            return str(valor).strip()
+    return ''
+
+
+def _extrair_numeros(registro: dict) -> list:
+    texto = _primeiro(registro, COLUNAS_NUMEROS)
+    if texto:
+        partes = [parte for parte in _SEPARADORES_NUMEROS.split(texto) if parte]
+    else:
+        # Planilhas com uma coluna por dezena (n1..n6, dezena1..dezena6)
+        partes = [
+            str(valor).strip()
+            for coluna, valor in registro.items()
+            if _COLUNA_DEZENA.match(coluna) and str(valor).strip()
+        ]
+    # Células numéricas do Excel chegam como float (ex.: 7.0)
+    return [int(float(parte)) for parte in partes]
+
+
+def registro_para_participante(registro: dict) -> Participante:
+    numeros = _extrair_numeros(registro)
+    cotas = int(float(_primeiro(registro, COLUNAS_COTAS) or 1))
+    valor = _primeiro(registro, COLUNAS_VALOR).replace('R$', '').strip()
+    return Participante(
+        nome=_primeiro(registro, COLUNAS_NOME),
+        valor_pago=float(valor.replace(',', '.')) if valor else ParticipanteService.calcular_valor_total(cotas),
+        numeros_escolhidos=numeros,
+        quantidade_cotas=cotas,
+        status_pagamento=_primeiro(registro, COLUNAS_STATUS).capitalize() or "Pendente"
+    )
+
+
+def importar_planilha(arquivo, nome_arquivo: str) -> dict:
+    """Importa uma planilha CSV/XLSX de apostas numa única transação.
+
+    Os erros são reportados pelo número da linha na planilha.
+    """
+    erros = []
+    linhas_enviadas = array('I')
+    
+    def participantes():
+        for numero_linha, registro in ler_planilha(arquivo, nome_arquivo):
+            try:
+                participante = registro_para_participante(registro)
+            except ValueError as e:
+                erros.append({'linha': numero_linha, 'nome': _primeiro(registro, COLUNAS_NOME), 'erro': f"Valor inválido: {e}"})
+                continue
+            linhas_enviadas.append(numero_linha)
+            yield participante
+    
+    resultado = ParticipanteService.adicionar_participantes_em_lote(participantes())
+    
+    # Converte a posição no lote de volta para o número da linha na planilha
+    erros.extend(
+        {'linha': linhas_enviadas[erro['indice']], 'nome': erro['nome'], 'erro': erro['erro']}
+        for erro in resultado['erros']
+    )
+    erros.sort(key=lambda erro: erro['linha'])
+    
+    return {
+        'inseridos': resultado['inseridos'],
+        'erros': erros,
+        'erro_geral': resultado.get('erro_geral')
+    }
+
+
+def ler_sorteios_planilha(arquivo, nome_arquivo: str):
+    """Lê sorteios (ex.: histórico oficial da Mega-Sena) de uma planilha CSV/XLSX.
+
+    Retorna (sorteios, erros); cada sorteio é um dict com linha, concurso, data e numeros.
+    """
+    sorteios = []
+    erros = []
+    for numero_linha, registro in ler_planilha(arquivo, nome_arquivo):
+        try:
+            numeros = _extrair_numeros(registro)
+            concurso = _primeiro(registro, COLUNAS_CONCURSO)
+            concurso = int(float(concurso)) if concurso else None
+        except ValueError as e:
+            erros.append({'linha': numero_linha, 'erro': f"Valor inválido: {e}"})
+            continue
+        if len(numeros) != 6 or len(set(numeros)) != 6 or any(not 1 <= n <= 60 for n in numeros):
+            erros.append({'linha': numero_linha, 'erro': "O sorteio deve ter 6 números distintos entre 1 e 60"})
+            continue
+        sorteios.append({
+            'linha': numero_linha,
+            'concurso': concurso,
+            'data': _primeiro(registro, COLUNAS_DATA) or None,
+            'numeros': sorted(numeros)
+        })
+    return sorteios, erros
+
+
+def _normalizar_nome(nome) -> str:
+    # Extratos costumam vir em maiúsculas e sem acento: compara sem caixa, acento e espaços extras
+    texto = unicodedata.normalize('NFKD', str(nome or '')).encode('ascii', 'ignore').decode()
+    return ' '.join(texto.lower().split())
+
+
+def _valor_monetario(texto: str):
+    # Aceita "35", "35.00", "35,00", "R$ 1.234,56"; None se não houver valor
+    texto = texto.replace('R$', '').replace(' ', '').strip()
+    if not texto:
+        return None
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    return round(float(texto), 2)
+
+
+def conciliar_extrato(arquivo, nome_arquivo: str) -> dict:
+    """Casa as linhas de um extrato bancário (CSV/XLSX) com participantes pendentes.
+
+    O nome do pagador é procurado num índice em memória (nome normalizado -> participantes);
+    havendo homônimos, o valor desempata. Sem nome correspondente, um valor que só um
+    participante pendente tem também serve. Nada é gravado: os ids conciliados vão para
+    ParticipanteService.atualizar_status_em_lote.
+    """
+    pendentes = ParticipanteService.carregar_em_colunas(status='Pendente')
+    valores = pendentes.valores_pagos.round(2).tolist()
+    por_nome = {}
+    por_valor = {}
+    for indice, nome in enumerate(pendentes.nomes):
+        por_nome.setdefault(_normalizar_nome(nome), []).append(indice)
+        por_valor.setdefault(valores[indice], []).append(indice)
+    
+    usados = set()
+    conciliados = []
+    ambiguos = []
+    nao_encontrados = []
+    
+    def livres(indices, limite=2):
+        # Basta saber se sobra exatamente um candidato
+        encontrados = []
+        for indice in indices:
+            if indice not in usados:
+                encontrados.append(indice)
+                if len(encontrados) == limite:
+                    break
+        return encontrados
+    
+    for numero_linha, registro in ler_planilha(arquivo, nome_arquivo):
+        pagador = _primeiro(registro, COLUNAS_PAGADOR)
+        try:
+            valor = _valor_monetario(_primeiro(registro, COLUNAS_VALOR_EXTRATO))
+        except ValueError:
+            valor = None
+        
+        por_este_nome = por_nome.get(_normalizar_nome(pagador), []) if pagador else []
+        if por_este_nome:
+            criterio = 'nome'
+            candidatos = livres(por_este_nome, limite=len(por_este_nome))
+            if len(candidatos) > 1 and valor is not None:
+                criterio = 'nome e valor'
+                candidatos = [indice for indice in candidatos if valores[indice] == valor]
+        elif valor is not None:
+            criterio = 'valor'
+            candidatos = livres(por_valor.get(valor, []))
+        else:
+            criterio, candidatos = None, []
+        
+        linha = {'linha': numero_linha, 'pagador': pagador, 'valor': valor}
+        if len(candidatos) == 1:
+            indice = candidatos[0]
+            usados.add(indice)
+            conciliados.append({
+                **linha,
+                'id': int(pendentes.ids[indice]),
+                'nome': pendentes.nomes[indice],
+                'criterio': criterio
+            })
+        elif candidatos:
+            ambiguos.append({**linha, 'criterio': criterio})
+        else:
+            nao_encontrados.append(linha)
+    
+    return {'conciliados': conciliados, 'ambiguos': ambiguos, 'nao_encontrados': nao_encontrados}
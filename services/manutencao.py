@@ -0,0 +1,45 @@
+import argparse
+import json
+from config.database import init_db
+from config.monitoramento import configurar_logging
+from services.participante_service import ParticipanteService
+from services.pontuacao import conferir_premios_forca_bruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tarefas de manutenção do banco do bolão")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    
+    estatisticas = comandos.add_parser(
+        'estatisticas',
+        help="Confere a tabela de agregados contra a tabela participantes"
+    )
+    estatisticas.add_argument(
+        '--somente-verificar', action='store_true',
+        help="Apenas reporta divergências, sem reconstruir a tabela"
+    )
+    
+    comandos.add_parser(
+        'conferir-premios',
+        help="Confere a contagem de senas/quinas/quadras em forma fechada contra a expansão das apostas"
+    )
+    
+    args = parser.parse_args(argv)
+    configurar_logging()
+    
+    if args.comando == 'estatisticas':
+        init_db()
+        resultado = ParticipanteService.verificar_consistencia_estatisticas(
+            reparar=not args.somente_verificar
+        )
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0 if resultado['consistente'] or resultado['reparado'] else 1
+    
+    if args.comando == 'conferir-premios':
+        divergencias = conferir_premios_forca_bruta()
+        print(json.dumps({'consistente': not divergencias, 'divergencias': divergencias}, ensure_ascii=False, indent=2))
+        return 0 if not divergencias else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,186 +1,727 @@
-from typing import List
-from models.participante import Participante
-from config.database import get_db
+from concurrent.futures import Future
+from typing import Iterable, Iterator, List, Optional
+from models.participante import Participante, ParticipantesBatch, numeros_para_bitmask, bitmask_para_numeros
+from config.database import ESCRITOR_TIMEOUT_S, get_db, get_escritor, reconstruir_estatisticas
+from services.pontuacao import (
+    MAX_NUMEROS_APOSTA,
+    MIN_NUMEROS_APOSTA,
+    PlacarIncremental,
+    contar_acertos_lote,
+    indice_por_numero,
+    pares_semelhantes,
+    pontuar_sorteios,
+    premios_aposta,
+    selecionar_melhores
+)
+from services.cache import CacheVersionado
+from config.monitoramento import instrumentar
+import numpy as np
 import sqlite3
+import json
+import logging
+import re
 
+logger = logging.getLogger(__name__)
+
+@instrumentar
 class ParticipanteService:
     VALOR_COTA = 35.0  # Valor fixo da cota
+    MIN_NUMEROS = MIN_NUMEROS_APOSTA  # Aposta simples
+    MAX_NUMEROS = MAX_NUMEROS_APOSTA  # Maior aposta estendida
+    STATUS_VALIDOS = ("Pendente", "Pago", "Confirmado")
+    TIMEOUT_ESCRITA_S = ESCRITOR_TIMEOUT_S  # espera máxima pelo commit do escritor único
+    MAX_PONTUADORES = 500  # tamanho do placar de um sorteio; as faixas contam todas as apostas
+    
+    # Colunas lidas nas listagens, na ordem esperada por _participantes_das_linhas
+    _COLUNAS_LISTAGEM = (
+        "id, nome, valor_pago, numeros_escolhidos, "
+        "datetime(data_pagamento, 'localtime') AS data_pagamento, "
+        "status_pagamento, quantidade_cotas"
+    )
+    
+    # Leituras servidas da memória até a próxima escrita em participantes
+    _cache_leituras = CacheVersionado(tamanho_maximo=32)
+
+    @staticmethod
+    def obter_versao_dados() -> int:
+        with get_db() as conn:
+            return conn.execute("SELECT versao FROM versao_dados WHERE id = 1").fetchone()[0]
+
+    @staticmethod
+    def obter_versao_apostas() -> int:
+        # Como obter_versao_dados, mas ignora mudanças de status e pagamento
+        with get_db() as conn:
+            return conn.execute("SELECT versao_apostas FROM versao_dados WHERE id = 1").fetchone()[0]
+
+    @staticmethod
+    def invalidar_cache():
+        ParticipanteService._cache_leituras.invalidar()
+
+    @staticmethod
+    def estatisticas_cache() -> dict:
+        return ParticipanteService._cache_leituras.estatisticas()
+
+    @staticmethod
+    def buscar_apostas_identicas(numeros) -> List[dict]:
+        # O bitmask é a chave canônica da aposta (independe da ordem dos números),
+        # então a busca por apostas idênticas é uma consulta pontual no índice
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT id, nome
+                FROM participantes
+                WHERE numeros_bitmask = ?
+                ORDER BY id
+            """, (numeros_para_bitmask(numeros),)).fetchall()
+        return [{'id': row[0], 'nome': row[1]} for row in rows]
+
+    @staticmethod
+    def _inserir_participante(conn, participante: Participante, rejeitar_duplicada: bool = False) -> int:
+        logger.debug("Tentando adicionar participante: %s", participante)
+        
+        # Garantir que os números estejam em formato string
+        numeros_str = ','.join(map(str, sorted(participante.numeros_escolhidos)))
+        numeros_bitmask = numeros_para_bitmask(participante.numeros_escolhidos)
+        
+        if rejeitar_duplicada and conn.execute(
+            "SELECT 1 FROM participantes WHERE numeros_bitmask = ? LIMIT 1",
+            (numeros_bitmask,)
+        ).fetchone():
+            raise ValueError("Aposta idêntica já cadastrada")
+        
+        cursor = conn.execute(
+            """
+            INSERT INTO participantes (
+                nome, 
+                valor_pago, 
+                numeros_escolhidos, 
+                numeros_bitmask,
+                quantidade_numeros,
+                status_pagamento, 
+                quantidade_cotas,
+                data_pagamento
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
+            """,
+            (
+                participante.nome,
+                participante.valor_pago,
+                numeros_str,
+                numeros_bitmask,
+                len(participante.numeros_escolhidos),
+                participante.status_pagamento,
+                participante.quantidade_cotas
+            )
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def enfileirar_participante(participante: Participante, rejeitar_duplicada: bool = False) -> Future:
+        # Entra na fila do escritor único; o Future resolve com o id novo depois do commit
+        # do grupo, ou com a exceção (ValueError para aposta duplicada)
+        return get_escritor().enviar(
+            lambda conn: ParticipanteService._inserir_participante(conn, participante, rejeitar_duplicada)
+        )
 
     @staticmethod
-    def adicionar_participante(participante: Participante) -> bool:
+    def adicionar_participante(participante: Participante, rejeitar_duplicada: bool = False) -> bool:
         try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-                
-                # Debug
-                print(f"Tentando adicionar participante: {participante}")
-                
-                # Garantir que os números estejam em formato string
-                numeros_str = ','.join(map(str, sorted(participante.numeros_escolhidos)))
-                
-                cursor.execute(
-                    """
-                    INSERT INTO participantes (
-                        nome, 
-                        valor_pago, 
-                        numeros_escolhidos, 
-                        status_pagamento, 
-                        quantidade_cotas,
-                        data_pagamento
-                    )
-                    VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
-                    """,
-                    (
-                        participante.nome,
-                        participante.valor_pago,
-                        numeros_str,
-                        participante.status_pagamento,
-                        participante.quantidade_cotas
-                    )
+            participante_id = ParticipanteService.enfileirar_participante(
+                participante, rejeitar_duplicada
+            ).result(timeout=ParticipanteService.TIMEOUT_ESCRITA_S)
+            logger.debug("Participante adicionado com id %s", participante_id)
+            return True
+        except ValueError as e:
+            logger.info("%s; participante %r não adicionado", e, participante.nome)
+            return False
+        except Exception:
+            logger.exception("Erro ao adicionar participante")
+            return False
+
+    @staticmethod
+    def validar_participante(participante: Participante) -> Optional[str]:
+        # Retorna a mensagem de erro, ou None se o participante for válido
+        if not participante.nome or not str(participante.nome).strip():
+            return "Nome do participante não informado"
+        numeros = participante.numeros_escolhidos
+        if not ParticipanteService.MIN_NUMEROS <= len(numeros) <= ParticipanteService.MAX_NUMEROS:
+            return (
+                f"Escolha de {ParticipanteService.MIN_NUMEROS} a {ParticipanteService.MAX_NUMEROS} "
+                f"números (recebidos {len(numeros)})"
+            )
+        if len(set(numeros)) != len(numeros):
+            return "Há números repetidos na aposta"
+        if any(not 1 <= n <= 60 for n in numeros):
+            return "Os números devem estar entre 1 e 60"
+        if participante.status_pagamento not in ParticipanteService.STATUS_VALIDOS:
+            return f"Status de pagamento inválido: {participante.status_pagamento}"
+        return None
+
+    @staticmethod
+    def adicionar_participantes_em_lote(participantes: Iterable[Participante], rejeitar_duplicadas: bool = False) -> dict:
+        # Valida e insere todo o lote numa única transação com executemany, como uma
+        # operação isolada do escritor único: ou entram todas as linhas válidas ou nenhuma.
+        # Os inválidos são reportados pela posição no iterável, sem abortar o lote
+        erros = []
+        apostas_existentes = set()
+        if rejeitar_duplicadas:
+            _, bitmasks = ParticipanteService.carregar_apostas()
+            apostas_existentes = set(bitmasks.tolist())
+        
+        def linhas_validas():
+            for indice, participante in enumerate(participantes):
+                erro = ParticipanteService.validar_participante(participante)
+                if erro:
+                    erros.append({'indice': indice, 'nome': participante.nome, 'erro': erro})
+                    continue
+                bitmask = numeros_para_bitmask(participante.numeros_escolhidos)
+                if rejeitar_duplicadas:
+                    if bitmask in apostas_existentes:
+                        erros.append({'indice': indice, 'nome': participante.nome, 'erro': "Aposta idêntica já cadastrada"})
+                        continue
+                    apostas_existentes.add(bitmask)
+                yield (
+                    participante.nome.strip(),
+                    participante.valor_pago,
+                    ','.join(map(str, sorted(participante.numeros_escolhidos))),
+                    bitmask,
+                    len(participante.numeros_escolhidos),
+                    participante.status_pagamento,
+                    participante.quantidade_cotas
                 )
-                conn.commit()
-                print("Participante adicionado com sucesso!")
-                return True
+        
+        try:
+            # Sem prazo: desistir de esperar não cancelaria uma importação já em andamento
+            inseridos = get_escritor().executar(
+                lambda conn: ParticipanteService._inserir_linhas(conn, linhas_validas()),
+                timeout=None,
+                isolada=True
+            )
         except Exception as e:
-            print(f"Erro ao adicionar participante: {e}")
-            return False
+            logger.exception("Erro ao adicionar participantes em lote")
+            return {'inseridos': 0, 'erros': erros, 'erro_geral': str(e)}
+        
+        return {'inseridos': inseridos, 'erros': erros}
+
+    @staticmethod
+    def _inserir_linhas(conn, linhas) -> int:
+        cursor = conn.executemany(
+            """
+            INSERT INTO participantes (
+                nome,
+                valor_pago,
+                numeros_escolhidos,
+                numeros_bitmask,
+                quantidade_numeros,
+                status_pagamento,
+                quantidade_cotas,
+                data_pagamento
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
+            """,
+            linhas
+        )
+        return cursor.rowcount
 
     @staticmethod
     def listar_participantes() -> List[Participante]:
         try:
+            versao = ParticipanteService.obter_versao_dados()
+            participantes = ParticipanteService._cache_leituras.obter(
+                'listar_participantes', versao, ParticipanteService._carregar_participantes
+            )
+            return list(participantes)
+        except Exception:
+            logger.exception("Erro ao listar participantes")
+            return []
+
+    @staticmethod
+    def _carregar_participantes() -> List[Participante]:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {ParticipanteService._COLUNAS_LISTAGEM}
+                FROM participantes 
+                ORDER BY id DESC
+            """)
+            return ParticipanteService._participantes_das_linhas(cursor.fetchall())
+
+    @staticmethod
+    def _participantes_das_linhas(rows) -> List[Participante]:
+        participantes = []
+        # Verificado uma vez por lote para não formatar nada por linha fora do modo DEBUG
+        detalhar = logger.isEnabledFor(logging.DEBUG)
+        for row in rows:
+            try:
+                participante = Participante.do_banco(*row)
+                participantes.append(participante)
+                if detalhar:
+                    logger.debug("Participante carregado: %s", participante)
+            except Exception:
+                logger.warning("Erro ao processar participante id=%s", row[0], exc_info=True)
+                continue
+        
+        return participantes
+
+    @staticmethod
+    def _montar_filtros(nome=None, status=None, data_inicio=None, data_fim=None, numeros=None):
+        # Monta a cláusula WHERE dos filtros; todos os filtros são resolvidos no SQLite
+        condicoes = []
+        parametros = []
+        
+        termos = re.findall(r'\w+', nome or '')
+        if termos:
+            # Cada termo vira um prefixo entre aspas, o que neutraliza a sintaxe do FTS5
+            condicoes.append(
+                "id IN (SELECT rowid FROM participantes_fts WHERE participantes_fts MATCH ?)"
+            )
+            parametros.append(' '.join(f'"{termo}"*' for termo in termos))
+        
+        if status:
+            status = [status] if isinstance(status, str) else list(status)
+            condicoes.append(f"status_pagamento IN ({', '.join('?' * len(status))})")
+            parametros.extend(status)
+        
+        if data_inicio:
+            condicoes.append("data_pagamento >= ?")
+            parametros.append(str(data_inicio))
+        
+        if data_fim:
+            condicoes.append("data_pagamento < date(?, '+1 day')")
+            parametros.append(str(data_fim))
+        
+        if numeros:
+            # A aposta precisa conter todos os números filtrados
+            bitmask = numeros_para_bitmask(numeros)
+            condicoes.append("(numeros_bitmask & ?) = ?")
+            parametros.extend([bitmask, bitmask])
+        
+        return condicoes, parametros
+
+    @staticmethod
+    def buscar_participantes(apos_id: Optional[int] = None, tamanho_pagina: int = 50, **filtros) -> List[Participante]:
+        # Paginação por chave (keyset) em id decrescente: cada página começa
+        # depois do último id da anterior, sem OFFSET nem leitura da tabela toda
+        try:
+            condicoes, parametros = ParticipanteService._montar_filtros(**filtros)
+            if apos_id is not None:
+                condicoes.append("id < ?")
+                parametros.append(apos_id)
+            where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+            
             with get_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        id,
-                        nome,
-                        valor_pago,
-                        numeros_escolhidos,
-                        datetime(data_pagamento, 'localtime') as data_pagamento,
-                        status_pagamento,
-                        quantidade_cotas
-                    FROM participantes 
+                cursor = conn.execute(f"""
+                    SELECT {ParticipanteService._COLUNAS_LISTAGEM}
+                    FROM participantes
+                    {where}
                     ORDER BY id DESC
-                """)
-                rows = cursor.fetchall()
-                
-                participantes = []
-                for row in rows:
-                    try:
-                        # Converte a string de números de volta para lista
-                        numeros_str = row[3] if row[3] else ''
-                        numeros = [int(n.strip()) for n in numeros_str.split(',') if n.strip()]
-                        
-                        participante = Participante(
-                            id=row[0],
-                            nome=row[1],
-                            valor_pago=float(row[2]),
-                            numeros_escolhidos=numeros,
-                            data_pagamento=row[4],
-                            status_pagamento=row[5],
-                            quantidade_cotas=int(row[6])
-                        )
-                        participantes.append(participante)
-                        print(f"Participante carregado: {participante}")
-                    except Exception as e:
-                        print(f"Erro ao processar participante: {e}")
-                        continue
-                
-                return participantes
-        except Exception as e:
-            print(f"Erro ao listar participantes: {e}")
+                    LIMIT ?
+                """, (*parametros, tamanho_pagina))
+                return ParticipanteService._participantes_das_linhas(cursor.fetchall())
+        except Exception:
+            logger.exception("Erro ao buscar participantes")
             return []
 
+    @staticmethod
+    def listar_pagina(apos_id: Optional[int] = None, tamanho_pagina: int = 50) -> List[Participante]:
+        return ParticipanteService.buscar_participantes(apos_id, tamanho_pagina)
+
+    @staticmethod
+    def iterar_participantes(tamanho_pagina: int = 1000, **filtros) -> Iterator[Participante]:
+        # Percorre todos os participantes página a página, com memória constante
+        apos_id = None
+        while True:
+            pagina = ParticipanteService.buscar_participantes(apos_id, tamanho_pagina, **filtros)
+            if not pagina:
+                return
+            yield from pagina
+            apos_id = pagina[-1].id
+
+    @staticmethod
+    def carregar_em_colunas(**filtros) -> ParticipantesBatch:
+        # Para pools grandes: uma linha vira entradas em arrays, não um objeto Participante
+        condicoes, parametros = ParticipanteService._montar_filtros(**filtros)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        with get_db() as conn:
+            rows = conn.execute(f"""
+                SELECT
+                    id, nome, valor_pago, numeros_bitmask,
+                    datetime(data_pagamento, 'localtime'),
+                    status_pagamento, quantidade_cotas
+                FROM participantes
+                {where}
+                ORDER BY id DESC
+            """, parametros).fetchall()
+        return ParticipantesBatch.das_linhas(rows)
+
+    @staticmethod
+    def contar_participantes(**filtros) -> int:
+        with get_db() as conn:
+            filtros_ativos = {chave: valor for chave, valor in filtros.items() if valor}
+            if not re.search(r'\w', filtros_ativos.get('nome', '')):
+                # Nome sem nenhum termo pesquisável (só pontuação) não filtra nada
+                filtros_ativos.pop('nome', None)
+            if set(filtros_ativos) <= {'status'}:
+                # Sem filtros (ou só por status) a contagem sai da tabela de agregados
+                status = filtros_ativos.get('status')
+                if status:
+                    status = [status] if isinstance(status, str) else list(status)
+                    return conn.execute(f"""
+                        SELECT COALESCE(SUM(total_participantes), 0)
+                        FROM estatisticas_status
+                        WHERE status_pagamento IN ({', '.join('?' * len(status))})
+                    """, status).fetchone()[0]
+                return conn.execute(
+                    "SELECT COALESCE(SUM(total_participantes), 0) FROM estatisticas_status"
+                ).fetchone()[0]
+            
+            condicoes, parametros = ParticipanteService._montar_filtros(**filtros)
+            where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+            return conn.execute(f"SELECT COUNT(*) FROM participantes {where}", parametros).fetchone()[0]
+
     @staticmethod
     def calcular_valor_total(quantidade_cotas: int) -> float:
         return quantidade_cotas * ParticipanteService.VALOR_COTA
 
+    @staticmethod
+    def _atualizar_status(conn, participante_id, novo_status):
+        # Atualizar status e data de pagamento se for marcado como pago
+        if novo_status in ['Pago', 'Confirmado']:
+            cursor = conn.execute("""
+                UPDATE participantes 
+                SET status_pagamento = ?,
+                    data_pagamento = datetime('now', 'localtime')
+                WHERE id = ?
+            """, (novo_status, participante_id))
+        else:
+            cursor = conn.execute("""
+                UPDATE participantes 
+                SET status_pagamento = ?
+                WHERE id = ?
+            """, (novo_status, participante_id))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Participante {participante_id} não encontrado")
+
+    @staticmethod
+    def enfileirar_status(participante_id, novo_status) -> Future:
+        return get_escritor().enviar(
+            lambda conn: ParticipanteService._atualizar_status(conn, participante_id, novo_status)
+        )
+
     @staticmethod
     def atualizar_status_pagamento(participante_id, novo_status):
         try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-                
-                # Atualizar status e data de pagamento se for marcado como pago
-                if novo_status in ['Pago', 'Confirmado']:
-                    cursor.execute("""
-                        UPDATE participantes 
-                        SET status_pagamento = ?,
-                            data_pagamento = datetime('now', 'localtime')
-                        WHERE id = ?
-                    """, (novo_status, participante_id))
-                else:
-                    cursor.execute("""
-                        UPDATE participantes 
-                        SET status_pagamento = ?
-                        WHERE id = ?
-                    """, (novo_status, participante_id))
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            print(f"Erro ao atualizar status: {e}")
+            ParticipanteService.enfileirar_status(participante_id, novo_status).result(
+                timeout=ParticipanteService.TIMEOUT_ESCRITA_S
+            )
+            return True
+        except ValueError as e:
+            logger.warning("Erro ao atualizar status: %s", e)
+            return False
+        except Exception:
+            logger.exception("Erro ao atualizar status")
             return False
 
+    @staticmethod
+    def _atualizar_status_em_lote(conn, ids, novo_status) -> int:
+        # Um único UPDATE por conjunto; a lista de ids vai como um parâmetro JSON
+        cursor = conn.execute("""
+            UPDATE participantes
+            SET status_pagamento = ?,
+                data_pagamento = CASE
+                    WHEN ? IN ('Pago', 'Confirmado') THEN datetime('now', 'localtime')
+                    ELSE data_pagamento
+                END
+            WHERE id IN (SELECT value FROM json_each(?))
+              AND status_pagamento IS NOT ?
+        """, (novo_status, novo_status, json.dumps([int(i) for i in ids]), novo_status))
+        return cursor.rowcount
+
+    @staticmethod
+    def atualizar_status_em_lote(ids, novo_status) -> int:
+        # Retorna quantos participantes mudaram de status (os que já estavam nele são ignorados)
+        if novo_status not in ParticipanteService.STATUS_VALIDOS:
+            logger.warning("Status inválido: %r", novo_status)
+            return 0
+        ids = list(ids)
+        if not ids:
+            return 0
+        try:
+            return get_escritor().enviar(
+                lambda conn: ParticipanteService._atualizar_status_em_lote(conn, ids, novo_status)
+            ).result(timeout=ParticipanteService.TIMEOUT_ESCRITA_S)
+        except Exception:
+            logger.exception("Erro ao atualizar status em lote")
+            return 0
+
     @staticmethod
     def obter_estatisticas():
-        participantes = ParticipanteService.listar_participantes()
+        # Leitura O(1) dos agregados mantidos pelos triggers (uma linha por status)
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT status_pagamento, total_participantes, total_arrecadado, total_cotas
+                FROM estatisticas_status
+                WHERE total_participantes > 0
+            """).fetchall()
+        
+        por_status = {
+            row[0]: {
+                'total_participantes': row[1],
+                'total_arrecadado': round(row[2], 2),
+                'total_cotas': row[3]
+            }
+            for row in rows
+        }
         return {
-            'total_participantes': len(participantes),
-            'total_arrecadado': sum(p.valor_pago for p in participantes)
+            'total_participantes': sum(s['total_participantes'] for s in por_status.values()),
+            'total_arrecadado': round(sum(s['total_arrecadado'] for s in por_status.values()), 2),
+            'total_cotas': sum(s['total_cotas'] for s in por_status.values()),
+            'por_status': por_status
+        }
+
+    @staticmethod
+    def verificar_consistencia_estatisticas(reparar: bool = True) -> dict:
+        # Compara os agregados com um recálculo completo e, se pedido, reconstrói a tabela
+        with get_db() as conn:
+            esperado = {
+                row[0]: (row[1], round(row[2], 2), row[3])
+                for row in conn.execute("""
+                    SELECT
+                        COALESCE(status_pagamento, 'Pendente'),
+                        COUNT(*),
+                        COALESCE(SUM(valor_pago), 0),
+                        COALESCE(SUM(COALESCE(quantidade_cotas, 0)), 0)
+                    FROM participantes
+                    GROUP BY COALESCE(status_pagamento, 'Pendente')
+                """)
+            }
+            atual = {
+                row[0]: (row[1], round(row[2], 2), row[3])
+                for row in conn.execute("""
+                    SELECT status_pagamento, total_participantes, total_arrecadado, total_cotas
+                    FROM estatisticas_status
+                    WHERE total_participantes != 0 OR total_arrecadado != 0 OR total_cotas != 0
+                """)
+            }
+            divergencias = {
+                status: {'esperado': esperado.get(status), 'atual': atual.get(status)}
+                for status in set(esperado) | set(atual)
+                if esperado.get(status) != atual.get(status)
+            }
+        
+        if divergencias and reparar:
+            get_escritor().executar(reconstruir_estatisticas)
+        
+        return {
+            'consistente': not divergencias,
+            'divergencias': divergencias,
+            'reparado': bool(divergencias) and reparar
         }
 
     @staticmethod
     def analisar_numeros_repetidos():
-        participantes = ParticipanteService.listar_participantes()
+        # Agrupa pelo índice invertido: só percorre os números escolhidos por mais de uma aposta
         todos_numeros = {}
+        with get_db() as conn:
+            cursor = conn.execute("""
+                SELECT pn.numero, p.nome
+                FROM participante_numeros pn
+                JOIN participantes p ON p.id = pn.participante_id
+                WHERE pn.numero IN (
+                    SELECT numero
+                    FROM participante_numeros
+                    GROUP BY numero
+                    HAVING COUNT(*) > 1
+                )
+                ORDER BY pn.numero, p.id DESC
+            """)
+            for numero, nome in cursor:
+                todos_numeros.setdefault(numero, []).append(nome)
+        
+        return todos_numeros
+
+    @staticmethod
+    def verificar_resultados(numeros_sorteados, usar_indice: bool = False, top_k: int = MAX_PONTUADORES):
+        if usar_indice:
+            return ParticipanteService._verificar_resultados_sql(numeros_sorteados, top_k)
+        
+        sorteio_bitmask = numeros_para_bitmask(numeros_sorteados)
+        ids, apostas = ParticipanteService.carregar_apostas()
         
-        for participante in participantes:
-            for num in participante.numeros_escolhidos:
-                if num in todos_numeros:
-                    todos_numeros[num].append(participante.nome)
-                else:
-                    todos_numeros[num] = [participante.nome]
+        # Pontuação vetorizada: popcount(aposta & sorteio) para todas as apostas
+        acertos = contar_acertos_lote(apostas, sorteio_bitmask)
         
-        return {k:v for k,v in todos_numeros.items() if len(v) > 1} 
+        # Os top_k de quem acertou 3 ou mais, ordenados por acertos (empate: id mais recente);
+        # o restante só entra nas contagens por faixa
+        selecionados = selecionar_melhores(acertos, top_k, np.flatnonzero(acertos >= 3))
+        nomes = ParticipanteService._nomes_por_id(ids[selecionados])
+        
+        resultados = ParticipanteService._montar_resultados(
+            (nomes[int(ids[i])], apostas[i], int(acertos[i])) for i in selecionados
+        )
+        resultados['por_acertos'] = np.bincount(acertos, minlength=7).tolist()
+        return resultados
+
+    @staticmethod
+    def carregar_apostas():
+        # Retorna (ids, bitmasks) de todas as apostas, em id decrescente
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT id, numeros_bitmask
+                FROM participantes
+                ORDER BY id DESC
+            """).fetchall()
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        apostas = np.fromiter((row[1] for row in rows), dtype=np.uint64, count=len(rows))
+        return ids, apostas
+
+    @staticmethod
+    def _carregar_indice_apostas():
+        ids, apostas = ParticipanteService.carregar_apostas()
+        return ids, apostas, indice_por_numero(apostas)
+
+    @staticmethod
+    def iniciar_placar(top_k: int = 10):
+        # Placar ao vivo do sorteio: apostas e índice por número ficam em cache até os dados mudarem
+        versao = ParticipanteService.obter_versao_dados()
+        ids, apostas, indice = ParticipanteService._cache_leituras.obter(
+            'indice_apostas', versao, ParticipanteService._carregar_indice_apostas
+        )
+        return versao, ids, PlacarIncremental(apostas, indice, top_k=top_k)
 
     @staticmethod
-    def verificar_resultados(numeros_sorteados):
-        participantes = ParticipanteService.listar_participantes()
+    def resultados_placar(ids, placar: PlacarIncremental):
+        # Mesmo formato de verificar_resultados, restrito aos K melhores do placar
+        nomes = ParticipanteService._nomes_por_id(ids[placar.melhores])
+        return ParticipanteService._montar_resultados(
+            (nomes[int(ids[i])], placar.apostas[i], int(placar.acertos[i])) for i in placar.melhores
+        )
+
+    @staticmethod
+    def _nomes_por_id(ids) -> dict:
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        if ids.size == 0:
+            return {}
+        with get_db() as conn:
+            return dict(conn.execute(
+                "SELECT id, nome FROM participantes WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids.tolist()),)
+            ).fetchall())
+
+    @staticmethod
+    def simular_sorteios(sorteios, top_k: int = 5, processos: Optional[int] = None) -> dict:
+        # Pontua o bolão contra vários sorteios (hipotéticos ou históricos) de uma vez
+        sorteios = np.asarray(sorteios, dtype=np.int64).reshape(-1, 6)
+        ids, apostas = ParticipanteService.carregar_apostas()
+        histograma, melhores, acertos_melhores = pontuar_sorteios(
+            apostas, sorteios, top_k=top_k, processos=processos
+        )
+        
+        nomes = ParticipanteService._nomes_por_id(ids[melhores.ravel()])
+        return {
+            'sorteios': sorteios.tolist(),
+            'histograma': histograma,
+            'maiores_pontuadores': [
+                [
+                    {
+                        'nome': nomes[int(ids[indice])],
+                        'numeros': bitmask_para_numeros(apostas[indice]),
+                        'acertos': int(acertos)
+                    }
+                    for indice, acertos in zip(linha_indices, linha_acertos)
+                ]
+                for linha_indices, linha_acertos in zip(melhores, acertos_melhores)
+            ]
+        }
+
+    @staticmethod
+    def _verificar_resultados_sql(numeros_sorteados, top_k: int = MAX_PONTUADORES):
+        # Caminho alternativo pelo índice invertido: lê só as linhas dos números sorteados
+        with get_db() as conn:
+            rows = conn.execute("""
+                SELECT p.nome, p.numeros_bitmask, COUNT(*) AS acertos
+                FROM participante_numeros pn
+                JOIN participantes p ON p.id = pn.participante_id
+                WHERE pn.numero IN (SELECT value FROM json_each(?))
+                GROUP BY pn.participante_id
+                HAVING COUNT(*) >= 3
+                ORDER BY acertos DESC, pn.participante_id DESC
+                LIMIT ?
+            """, (json.dumps([int(n) for n in numeros_sorteados]), top_k)).fetchall()
+            # Apostas por quantidade de acertos; quem não aparece no índice acertou zero
+            por_acertos = [0] * 7
+            for acertos, quantidade in conn.execute("""
+                SELECT acertos, COUNT(*) FROM (
+                    SELECT COUNT(*) AS acertos
+                    FROM participante_numeros
+                    WHERE numero IN (SELECT value FROM json_each(?))
+                    GROUP BY participante_id
+                ) GROUP BY acertos
+            """, (json.dumps([int(n) for n in numeros_sorteados]),)):
+                por_acertos[acertos] = quantidade
+            por_acertos[0] = conn.execute("SELECT COUNT(*) FROM participantes").fetchone()[0] - sum(por_acertos)
+        
+        resultados = ParticipanteService._montar_resultados(
+            (row[0], row[1], row[2]) for row in rows
+        )
+        resultados['por_acertos'] = por_acertos
+        return resultados
+
+    @staticmethod
+    def _montar_resultados(pontuadores):
+        # pontuadores: (nome, bitmask, acertos) já ordenados por acertos
         resultados = {
             'ganhadores': [],
             'maiores_pontuadores': []
         }
-        
-        max_acertos = 0
-        for participante in participantes:
-            # Converter números para set para fazer a interseção
-            numeros_participante = set(participante.numeros_escolhidos)
-            numeros_sorteados_set = set(numeros_sorteados)
-            
-            # Calcular acertos
-            acertos = len(numeros_participante.intersection(numeros_sorteados_set))
-            
+        for nome, bitmask, acertos in pontuadores:
+            numeros = bitmask_para_numeros(bitmask)
+            pontuador = {
+                'nome': nome,
+                'numeros': numeros,
+                'acertos': acertos,
+                # Prêmios em forma fechada, válidos também para apostas de 7 a 15 números
+                **premios_aposta(len(numeros), acertos)
+            }
             # Se acertou tudo
             if acertos == 6:
-                resultados['ganhadores'].append({
-                    'nome': participante.nome,
-                    'numeros': sorted(participante.numeros_escolhidos),
-                    'acertos': acertos
-                })
-            
-            # Atualizar máximo de acertos
-            max_acertos = max(max_acertos, acertos)
-            
-            # Se não houver ganhadores, guardar os maiores pontuadores
-            if acertos >= 3:  # Guardar quem acertou 3 ou mais
-                resultados['maiores_pontuadores'].append({
-                    'nome': participante.nome,
-                    'numeros': sorted(participante.numeros_escolhidos),
-                    'acertos': acertos
-                })
-        
-        # Ordenar maiores pontuadores por número de acertos
-        resultados['maiores_pontuadores'].sort(key=lambda x: x['acertos'], reverse=True)
-        
-        return resultados 
\ No newline at end of file
+                resultados['ganhadores'].append(dict(pontuador))
+            resultados['maiores_pontuadores'].append(pontuador)
+        
+        return resultados
+
+    @staticmethod
+    def relatorio_apostas_duplicadas(min_compartilhados: int = 5, limite_semelhantes: int = 1000) -> dict:
+        # Apostas idênticas saem do GROUP BY na chave canônica (bitmask)
+        with get_db() as conn:
+            identicas = [
+                {
+                    'numeros': bitmask_para_numeros(row[0]),
+                    'participantes': json.loads(row[1])
+                }
+                for row in conn.execute("""
+                    SELECT numeros_bitmask, json_group_array(nome)
+                    FROM (SELECT numeros_bitmask, nome FROM participantes ORDER BY id)
+                    GROUP BY numeros_bitmask
+                    HAVING COUNT(*) > 1
+                    ORDER BY COUNT(*) DESC
+                """)
+            ]
+        
+        # Semelhantes: pares candidatos por blocagem nos subconjuntos, conferidos com popcount
+        ids, apostas = ParticipanteService.carregar_apostas()
+        pares = pares_semelhantes(apostas, min_compartilhados)
+        # Acima do limite, o relatório fica com os pares mais parecidos e informa o total
+        total_semelhantes = len(pares)
+        pares = pares[:limite_semelhantes]
+        nomes = ParticipanteService._nomes_por_id(ids[pares[:, :2].ravel()]) if len(pares) else {}
+        semelhantes = [
+            {
+                'participante_a': nomes[int(ids[a])],
+                'numeros_a': bitmask_para_numeros(apostas[a]),
+                'participante_b': nomes[int(ids[b])],
+                'numeros_b': bitmask_para_numeros(apostas[b]),
+                'compartilhados': int(compartilhados)
+            }
+            for a, b, compartilhados in pares
+        ]
+        return {'identicas': identicas, 'semelhantes': semelhantes, 'total_semelhantes': total_semelhantes}
@@ -0,0 +1,345 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+from math import comb
+from typing import List, Optional
+import numpy as np
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+_POSICOES_BITS = np.arange(60, dtype=np.uint64)
+
+
+def contar_acertos(aposta_bitmask: int, sorteio_bitmask: int) -> int:
+    return (int(aposta_bitmask) & int(sorteio_bitmask)).bit_count()
+
+
+def popcount(valores: np.ndarray) -> np.ndarray:
+    valores = np.asarray(valores, dtype=np.uint64)
+    # NumPy >= 2.0 tem popcount nativo; nas versões anteriores usamos SWAR
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(valores)
+
+    v = valores - ((valores >> np.uint64(1)) & _M1)
+    v = (v & _M2) + ((v >> np.uint64(2)) & _M2)
+    v = (v + (v >> np.uint64(4))) & _M4
+    return ((v * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def contar_acertos_lote(apostas_bitmask: np.ndarray, sorteio_bitmask: int) -> np.ndarray:
+    # Pontua todas as apostas de uma vez: popcount(aposta & sorteio)
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    return popcount(apostas & np.uint64(sorteio_bitmask)).astype(np.uint8)
+
+
+def selecionar_melhores(acertos: np.ndarray, k: int, posicoes: Optional[np.ndarray] = None) -> np.ndarray:
+    # Top-k por acertos (empate: menor posição) sem ordenar o vetor inteiro: argpartition
+    # separa os k maiores em O(n) e só eles são ordenados
+    total = acertos.size
+    posicoes = np.arange(total) if posicoes is None else np.asarray(posicoes, dtype=np.int64)
+    k = min(k, posicoes.size)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    chaves = acertos[posicoes].astype(np.int64) * (total + 1) + (total - posicoes)
+    topo = np.argpartition(chaves, -k)[-k:]
+    return posicoes[topo[np.argsort(-chaves[topo])]]
+
+
+# Acima deste número de pares (sorteio x aposta) a simulação usa vários processos
+LIMIAR_PARALELO = 50_000_000
+# Quantidade máxima de células da matriz de acertos calculada de uma vez
+CELULAS_POR_BLOCO = 4_000_000
+
+
+def sorteios_para_bitmasks(sorteios) -> np.ndarray:
+    # Converte uma matriz N x 6 de números em N bitmasks
+    sorteios = np.asarray(sorteios, dtype=np.uint64)
+    if sorteios.ndim != 2:
+        raise ValueError("Os sorteios devem ser uma matriz N x 6")
+    if sorteios.size and (sorteios.min() < 1 or sorteios.max() > 60):
+        raise ValueError("Os números sorteados devem estar entre 1 e 60")
+    return np.bitwise_or.reduce(np.uint64(1) << (sorteios - np.uint64(1)), axis=1)
+
+
+def _pontuar_bloco(apostas: np.ndarray, sorteios: np.ndarray, top_k: int):
+    # Matriz de acertos (sorteios x apostas) do bloco, via popcount(sorteio & aposta)
+    acertos = popcount(sorteios[:, None] & apostas[None, :]).astype(np.uint8)
+    
+    # Histograma por linha num único bincount, deslocando cada linha em 7 posições
+    deslocamento = (np.arange(len(sorteios)) * 7)[:, None]
+    histograma = np.bincount(
+        (acertos + deslocamento).ravel(), minlength=7 * len(sorteios)
+    ).reshape(len(sorteios), 7)
+    
+    k = min(top_k, apostas.size)
+    if k == 0:
+        vazio = np.empty((len(sorteios), 0), dtype=np.int64)
+        return histograma, vazio, vazio.astype(np.uint8)
+    melhores = np.argpartition(acertos, -k, axis=1)[:, -k:]
+    acertos_melhores = np.take_along_axis(acertos, melhores, axis=1)
+    ordem = np.argsort(-acertos_melhores.astype(np.int16), axis=1, kind='stable')
+    return (
+        histograma,
+        np.take_along_axis(melhores, ordem, axis=1),
+        np.take_along_axis(acertos_melhores, ordem, axis=1)
+    )
+
+
+def pontuar_sorteios(apostas_bitmask, sorteios, top_k: int = 5, processos: int = None):
+    """Pontua todas as apostas contra vários sorteios de uma vez.
+
+    Retorna (histograma N x 7 de apostas por quantidade de acertos,
+    índices N x top_k das melhores apostas, acertos N x top_k dessas apostas).
+    Com processos=None, usa vários processos só quando N x M passa de LIMIAR_PARALELO.
+    """
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    sorteios = np.asarray(sorteios, dtype=np.uint64)
+    if sorteios.ndim == 2:
+        sorteios = sorteios_para_bitmasks(sorteios)
+    
+    tamanho_bloco = max(1, CELULAS_POR_BLOCO // max(1, apostas.size))
+    blocos = [sorteios[i:i + tamanho_bloco] for i in range(0, len(sorteios), tamanho_bloco)]
+    
+    if processos is None:
+        processos = os.cpu_count() if len(sorteios) * apostas.size > LIMIAR_PARALELO else 1
+    
+    if processos > 1 and len(blocos) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            partes = list(executor.map(
+                _pontuar_bloco, repeat(apostas), blocos, repeat(top_k)
+            ))
+    else:
+        partes = [_pontuar_bloco(apostas, bloco, top_k) for bloco in blocos]
+    
+    if not partes:
+        k = min(top_k, apostas.size)
+        return (
+            np.zeros((0, 7), dtype=np.int64),
+            np.zeros((0, k), dtype=np.int64),
+            np.zeros((0, k), dtype=np.uint8)
+        )
+    return tuple(np.concatenate(coluna) for coluna in zip(*partes))
+
+
+def _histograma_apostas_bloco(apostas: np.ndarray, sorteios: np.ndarray) -> np.ndarray:
+    # Para cada aposta do bloco, em quantos sorteios ela fez 0..6 acertos
+    acertos = popcount(apostas[:, None] & sorteios[None, :]).astype(np.int64)
+    acertos += (np.arange(len(apostas)) * 7)[:, None]
+    return np.bincount(acertos.ravel(), minlength=7 * len(apostas)).reshape(len(apostas), 7)
+
+
+def histograma_por_aposta(apostas_bitmask, sorteios, processos: int = None) -> np.ndarray:
+    """Retorna uma matriz M x 7: para cada aposta, quantos sorteios tiveram 0..6 acertos."""
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    sorteios = np.asarray(sorteios, dtype=np.uint64)
+    if sorteios.ndim == 2:
+        sorteios = sorteios_para_bitmasks(sorteios)
+    if apostas.size == 0 or sorteios.size == 0:
+        return np.zeros((apostas.size, 7), dtype=np.int64)
+    
+    tamanho_bloco = max(1, CELULAS_POR_BLOCO // sorteios.size)
+    blocos = [apostas[i:i + tamanho_bloco] for i in range(0, apostas.size, tamanho_bloco)]
+    
+    if processos is None:
+        processos = os.cpu_count() if apostas.size * sorteios.size > LIMIAR_PARALELO else 1
+    
+    if processos > 1 and len(blocos) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            partes = list(executor.map(_histograma_apostas_bloco, blocos, repeat(sorteios)))
+    else:
+        partes = [_histograma_apostas_bloco(bloco, sorteios) for bloco in blocos]
+    return np.concatenate(partes)
+
+
+# Apostas da Mega-Sena podem ter de 6 a 15 números
+MIN_NUMEROS_APOSTA = 6
+MAX_NUMEROS_APOSTA = 15
+
+
+def premios_aposta(quantidade_numeros: int, acertos: int) -> dict:
+    """Senas, quinas e quadras de uma aposta de k números com h acertos, em forma fechada.
+
+    Uma aposta de k números equivale aos C(k, 6) jogos simples contidos nela; os jogos
+    com exatamente j acertos são C(h, j) * C(k - h, 6 - j), sem enumerar combinações.
+    """
+    k, h = int(quantidade_numeros), int(acertos)
+    return {
+        'senas': comb(h, 6) * comb(k - h, 0),
+        'quinas': comb(h, 5) * comb(k - h, 1),
+        'quadras': comb(h, 4) * comb(k - h, 2)
+    }
+
+
+# Tabela [k, h, j] com os jogos de j acertos de uma aposta de k números com h acertos
+_TABELA_PREMIOS = np.array([
+    [
+        [comb(h, j) * comb(k - h, 6 - j) if h <= k else 0 for j in range(7)]
+        for h in range(7)
+    ]
+    for k in range(MAX_NUMEROS_APOSTA + 1)
+], dtype=np.int64)
+
+
+def premios_lote(quantidades_numeros, acertos) -> np.ndarray:
+    # Versão vetorizada de premios_aposta: retorna M x 3 (senas, quinas, quadras)
+    tabela = _TABELA_PREMIOS[np.asarray(quantidades_numeros, dtype=np.int64), np.asarray(acertos, dtype=np.int64)]
+    return tabela[:, [6, 5, 4]]
+
+
+def conferir_premios_forca_bruta(max_numeros: int = MAX_NUMEROS_APOSTA) -> List[dict]:
+    """Confere a forma fechada contra a expansão de todas as combinações de 6 números.
+
+    Retorna a lista de divergências (vazia quando as fórmulas estão corretas).
+    """
+    sorteio = set(range(1, 7))
+    divergencias = []
+    for k in range(MIN_NUMEROS_APOSTA, max_numeros + 1):
+        for h in range(0, 7):
+            if h > k or k - h > 54:
+                continue
+            # Aposta com h números sorteados e k - h números fora do sorteio
+            aposta = list(range(1, h + 1)) + list(range(7, 7 + k - h))
+            contagem = {'senas': 0, 'quinas': 0, 'quadras': 0}
+            for jogo in combinations(aposta, 6):
+                acertos_jogo = len(sorteio.intersection(jogo))
+                if acertos_jogo == 6:
+                    contagem['senas'] += 1
+                elif acertos_jogo == 5:
+                    contagem['quinas'] += 1
+                elif acertos_jogo == 4:
+                    contagem['quadras'] += 1
+            formula = premios_aposta(k, h)
+            lote = dict(zip(('senas', 'quinas', 'quadras'), premios_lote([k], [h])[0].tolist()))
+            if formula != contagem or lote != contagem:
+                divergencias.append({
+                    'quantidade_numeros': k,
+                    'acertos': h,
+                    'forca_bruta': contagem,
+                    'formula': formula,
+                    'lote': lote
+                })
+    return divergencias
+
+
+def _subconjuntos(apostas: np.ndarray, tamanho: int):
+    # Todos os subconjuntos de `tamanho` números de cada aposta, como (chaves, índice da aposta)
+    quantidades = popcount(apostas).astype(np.int64)
+    chaves, donos = [], []
+    for k in np.unique(quantidades):
+        if k < tamanho:
+            continue
+        grupo = np.flatnonzero(quantidades == k)
+        bits = ((apostas[grupo, None] >> _POSICOES_BITS) & np.uint64(1)).astype(bool)
+        # Cada linha tem exatamente k bits ligados: matriz len(grupo) x k de valores 1 << posição
+        valores = np.uint64(1) << np.nonzero(bits)[1].astype(np.uint64).reshape(len(grupo), k)
+        for combinacao in combinations(range(k), tamanho):
+            chaves.append(np.bitwise_or.reduce(valores[:, combinacao], axis=1))
+            donos.append(grupo)
+    if not chaves:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    return np.concatenate(chaves), np.concatenate(donos)
+
+
+def pares_semelhantes(apostas_bitmask, min_compartilhados: int = 5, limite: int = None) -> np.ndarray:
+    """Pares de apostas distintas com pelo menos `min_compartilhados` números em comum.
+
+    Em vez de comparar todos os pares, agrupa as apostas por cada subconjunto de
+    `min_compartilhados` números (blocagem): só apostas que caem no mesmo bloco
+    são candidatas, e o par é confirmado com popcount(a & b). Apostas idênticas
+    são tratadas uma vez só (a primeira ocorrência representa o grupo).
+    Retorna uma matriz P x 3 com (índice a, índice b, números compartilhados), dos
+    mais para os menos parecidos; com `limite`, só os `limite` pares mais parecidos.
+    """
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    unicas, primeira_ocorrencia = np.unique(apostas, return_index=True)
+    chaves, donos = _subconjuntos(unicas, min_compartilhados)
+    
+    ordem = np.lexsort((donos, chaves))
+    chaves, donos = chaves[ordem], donos[ordem]
+    inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+    tamanhos = np.diff(np.r_[inicios, chaves.size])
+    
+    pares = set()
+    for inicio, tamanho in zip(inicios[tamanhos > 1], tamanhos[tamanhos > 1]):
+        membros = donos[inicio:inicio + tamanho].tolist()
+        for i, a in enumerate(membros):
+            for b in membros[i + 1:]:
+                pares.add((a, b))
+    
+    if not pares:
+        return np.empty((0, 3), dtype=np.int64)
+    pares = np.array(sorted(pares), dtype=np.int64)
+    compartilhados = popcount(unicas[pares[:, 0]] & unicas[pares[:, 1]]).astype(np.int64)
+    if limite is not None and len(pares) > limite:
+        # Os mais parecidos, não os primeiros encontrados; a ordem final vem logo abaixo
+        melhores = np.sort(np.argpartition(-compartilhados, limite - 1)[:limite])
+        pares, compartilhados = pares[melhores], compartilhados[melhores]
+    resultado = np.column_stack([
+        primeira_ocorrencia[pares[:, 0]],
+        primeira_ocorrencia[pares[:, 1]],
+        compartilhados
+    ])
+    return resultado[np.argsort(-compartilhados, kind='stable')]
+
+
+def indice_por_numero(apostas_bitmask) -> List[np.ndarray]:
+    # Índice invertido em memória: para cada número (1..60), as posições das apostas que o contêm
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    return [np.flatnonzero((apostas >> bit) & np.uint64(1)) for bit in _POSICOES_BITS]
+
+
+class PlacarIncremental:
+    """Placar de um sorteio em andamento, atualizado bola a bola.
+
+    Cada bola nova só toca as apostas que contêm aquele número (via o índice
+    por número) e o placar dos K melhores é refeito a partir dos K anteriores
+    mais as apostas afetadas: as demais não mudaram de pontuação, então não
+    podem ter entrado no topo. Empates ficam com a aposta de menor posição.
+    """
+
+    def __init__(self, apostas_bitmask, indice: Optional[List[np.ndarray]] = None, top_k: int = 10):
+        self.apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+        self.indice = indice if indice is not None else indice_por_numero(self.apostas)
+        self.top_k = top_k
+        self.acertos = np.zeros(self.apostas.size, dtype=np.uint8)
+        self.por_acertos = np.zeros(7, dtype=np.int64)
+        self.por_acertos[0] = self.apostas.size
+        self.numeros = []
+        self.melhores = np.empty(0, dtype=np.int64)
+
+    def adicionar(self, numero: int) -> np.ndarray:
+        if not 1 <= numero <= 60 or numero in self.numeros or len(self.numeros) == 6:
+            raise ValueError(f"Bola inválida para este sorteio: {numero}")
+        self.numeros.append(numero)
+        afetadas = self.indice[numero - 1]
+
+        # Faixas de acerto: as afetadas sobem exatamente uma faixa
+        antes = np.bincount(self.acertos[afetadas], minlength=7)[:6]
+        self.por_acertos[:6] -= antes
+        self.por_acertos[1:] += antes
+        self.acertos[afetadas] += 1
+
+        candidatas = np.union1d(self.melhores, afetadas) if self.melhores.size else afetadas
+        if candidatas.size:
+            self.melhores = selecionar_melhores(self.acertos, self.top_k, candidatas)
+        return afetadas
+
+    def sincronizar(self, numeros) -> bool:
+        # Alinha o placar com a lista de bolas; remover uma bola exige recomeçar do zero
+        numeros = list(numeros)
+        if self.numeros != numeros[:len(self.numeros)]:
+            self.reiniciar()
+        mudou = False
+        for numero in numeros[len(self.numeros):]:
+            self.adicionar(numero)
+            mudou = True
+        return mudou
+
+    def reiniciar(self):
+        self.acertos[:] = 0
+        self.por_acertos[:] = 0
+        self.por_acertos[0] = self.acertos.size
+        self.numeros = []
+        self.melhores = np.empty(0, dtype=np.int64)
@@ -0,0 +1,77 @@
+from typing import Optional
+from models.participante import numeros_para_bitmask
+from config.database import get_db, get_escritor
+from config.monitoramento import instrumentar
+from services.participante_service import ParticipanteService
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+@instrumentar
+class ResultadoService:
+    # Resultados pontuados ficam salvos por sorteio; cada visualização seguinte lê o
+    # snapshot em vez de pontuar o bolão de novo, até as apostas mudarem (versao_apostas:
+    # marcar pagamentos não descarta os snapshots)
+
+    @staticmethod
+    def obter_snapshot(numeros_sorteados) -> Optional[dict]:
+        # None se o sorteio ainda não foi pontuado ou se as apostas mudaram desde então
+        with get_db() as conn:
+            row = conn.execute("""
+                SELECT r.por_acertos, r.premiados, r.calculado_em, r.versao_apostas
+                FROM resultados r
+                JOIN versao_dados v ON v.id = 1 AND v.versao_apostas = r.versao_apostas
+                WHERE r.sorteio_bitmask = ?
+            """, (numeros_para_bitmask(numeros_sorteados),)).fetchone()
+        if row is None:
+            return None
+        return {
+            **json.loads(row[1]),
+            'por_acertos': json.loads(row[0]),
+            'calculado_em': row[2],
+            'versao_apostas': row[3]
+        }
+
+    @staticmethod
+    def _salvar_snapshot(conn, numeros_sorteados, versao: int, resultados: dict):
+        premiados = {
+            'ganhadores': resultados['ganhadores'],
+            'maiores_pontuadores': resultados['maiores_pontuadores']
+        }
+        conn.execute("""
+            INSERT OR REPLACE INTO resultados (
+                sorteio_bitmask,
+                numeros_sorteados,
+                versao_apostas,
+                por_acertos,
+                premiados
+            )
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            numeros_para_bitmask(numeros_sorteados),
+            ','.join(map(str, sorted(numeros_sorteados))),
+            versao,
+            json.dumps(resultados['por_acertos']),
+            json.dumps(premiados, ensure_ascii=False)
+        ))
+        # Snapshots de versões anteriores não voltam a valer
+        conn.execute("DELETE FROM resultados WHERE versao_apostas < ?", (versao,))
+
+    @staticmethod
+    def verificar_resultados(numeros_sorteados) -> dict:
+        snapshot = ResultadoService.obter_snapshot(numeros_sorteados)
+        if snapshot is not None:
+            return snapshot
+
+        # A versão é lida antes de pontuar: se as apostas mudarem no meio, o snapshot
+        # já nasce desatualizado e a próxima visualização pontua de novo
+        versao = ParticipanteService.obter_versao_apostas()
+        resultados = ParticipanteService.verificar_resultados(numeros_sorteados)
+        try:
+            get_escritor().enviar(
+                lambda conn: ResultadoService._salvar_snapshot(conn, numeros_sorteados, versao, resultados)
+            ).result(timeout=ParticipanteService.TIMEOUT_ESCRITA_S)
+        except Exception:
+            logger.exception("Erro ao salvar o resultado do sorteio")
+        return {**resultados, 'calculado_em': None, 'versao_apostas': versao}
@@ -0,0 +1,141 @@
+from itertools import combinations
+from math import comb
+from typing import Iterable, Optional
+import numpy as np
+from services.analise import coocorrencia_pares, frequencia_numeros
+from services.pontuacao import _POSICOES_BITS, popcount
+
+# Pesos do custo de uma aposta sugerida (menor é melhor), em ordem de prioridade:
+# cada quadra já coberta por alguma aposta pesa mais que qualquer quantidade de pares,
+# cada par já coberto mais que toda a sobreposição com as apostas existentes
+PESO_QUADRA = 10_000.0
+PESO_PAR = 100.0
+# Perturbação para desempatar de forma diferente a cada sugestão
+RUIDO = 1e-3
+MAX_PASSOS_BUSCA = 20
+RANKS_POR_CONTAGEM = 4_000_000
+
+TOTAL_QUADRAS = comb(60, 4)
+# Ranking colex de combinações: rank(a<b<c<d) = C(a,1) + C(b,2) + C(c,3) + C(d,4)
+_BINOMIAIS = np.array([[comb(n, k) for k in range(5)] for n in range(60)], dtype=np.int64)
+
+
+def _posicoes(apostas: np.ndarray, quantidade: int) -> np.ndarray:
+    # Matriz len(apostas) x quantidade com as posições (0..59) dos bits ligados, em ordem
+    bits = ((apostas[:, None] >> _POSICOES_BITS) & np.uint64(1)).astype(bool)
+    return np.nonzero(bits)[1].reshape(len(apostas), quantidade)
+
+
+def rank_quadras(posicoes: np.ndarray) -> np.ndarray:
+    # posicoes: (..., 4) em ordem crescente
+    return (
+        _BINOMIAIS[posicoes[..., 0], 1] + _BINOMIAIS[posicoes[..., 1], 2]
+        + _BINOMIAIS[posicoes[..., 2], 3] + _BINOMIAIS[posicoes[..., 3], 4]
+    )
+
+
+def contar_quadras(apostas_bitmask) -> np.ndarray:
+    # Quantas apostas contêm cada uma das C(60, 4) quadras, indexadas pelo rank colex
+    apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+    contagem = np.zeros(TOTAL_QUADRAS, dtype=np.int64)
+    quantidades = popcount(apostas).astype(np.int64)
+    # Os ranks são acumulados e contados em blocos: um bincount por combinação de colunas
+    # percorreria o vetor de quadras inteiro milhares de vezes nas apostas estendidas
+    pendentes, tamanho_pendente = [], 0
+    for k in np.unique(quantidades):
+        if k < 4:
+            continue
+        posicoes = _posicoes(apostas[quantidades == k], int(k))
+        for combinacao in combinations(range(k), 4):
+            pendentes.append(rank_quadras(posicoes[:, combinacao]))
+            tamanho_pendente += len(posicoes)
+            if tamanho_pendente >= RANKS_POR_CONTAGEM:
+                contagem += np.bincount(np.concatenate(pendentes), minlength=TOTAL_QUADRAS)
+                pendentes, tamanho_pendente = [], 0
+    if pendentes:
+        contagem += np.bincount(np.concatenate(pendentes), minlength=TOTAL_QUADRAS)
+    return contagem
+
+
+class EstadoCobertura:
+    """Quanto as apostas do bolão já cobrem cada número, par e quadra.
+
+    Novas apostas entram com `adicionar`, sem recalcular as existentes; é a
+    base do otimizador de `sugerir`.
+    """
+
+    def __init__(self):
+        self.total_apostas = 0
+        self.ultimo_id = 0
+        self.frequencia = np.zeros(60, dtype=np.int64)
+        self.pares = np.zeros((60, 60), dtype=np.int64)
+        self.quadras = np.zeros(TOTAL_QUADRAS, dtype=np.int64)
+
+    def adicionar(self, apostas_bitmask, ultimo_id: Optional[int] = None):
+        apostas = np.asarray(apostas_bitmask, dtype=np.uint64)
+        if apostas.size:
+            self.frequencia += frequencia_numeros(apostas)
+            self.pares += coocorrencia_pares(apostas)
+            self.quadras += contar_quadras(apostas)
+            self.total_apostas += int(apostas.size)
+        if ultimo_id is not None:
+            self.ultimo_id = max(self.ultimo_id, ultimo_id)
+
+    def _custo_candidatos(self, escolhidos, ruido: np.ndarray) -> np.ndarray:
+        # Custo de acrescentar cada número (0..59) aos já escolhidos; inf para os repetidos
+        escala = max(self.total_apostas, 1)
+        custo = self.frequencia / escala + ruido
+        if escolhidos:
+            linhas = self.pares[escolhidos]
+            custo = custo + (PESO_PAR * (linhas > 0) + linhas / escala).sum(axis=0)
+        if len(escolhidos) >= 3:
+            trios = np.array(list(combinations(sorted(escolhidos), 3)), dtype=np.int64)
+            candidatos = np.broadcast_to(np.arange(60), (len(trios), 60))
+            quadras = np.sort(
+                np.concatenate([np.repeat(trios[:, None, :], 60, axis=1), candidatos[..., None]], axis=2),
+                axis=2
+            )
+            # Candidatos repetidos geram ranks inválidos; são limitados aqui e descartados abaixo
+            ranks = np.minimum(rank_quadras(quadras), TOTAL_QUADRAS - 1)
+            custo = custo + PESO_QUADRA * (self.quadras[ranks] > 0).sum(axis=0)
+        custo[list(escolhidos)] = np.inf
+        return custo
+
+    def avaliar(self, numeros: Iterable[int]) -> dict:
+        posicoes = sorted(n - 1 for n in numeros)
+        pares = [self.pares[a, b] for a, b in combinations(posicoes, 2)]
+        quadras = [self.quadras[rank_quadras(np.array(q))] for q in combinations(posicoes, 4)]
+        return {
+            'quadras_novas': sum(1 for q in quadras if q == 0),
+            'quadras_total': len(quadras),
+            'pares_novos': sum(1 for p in pares if p == 0),
+            'pares_total': len(pares),
+            # Média de números em comum com as apostas existentes
+            'sobreposicao_media': float(self.frequencia[posicoes].sum() / max(self.total_apostas, 1))
+        }
+
+    def sugerir(self, quantidade: int = 6, fixos: Iterable[int] = (), semente: Optional[int] = None) -> list:
+        """Aposta de `quantidade` números que menos repete o que o bolão já cobre.
+
+        Guloso (cada número novo é o de menor custo incremental) seguido de busca
+        local: troca um número por vez enquanto alguma troca reduzir o custo.
+        Os números `fixos` entram na aposta e nunca são trocados.
+        """
+        ruido = np.random.default_rng(semente).random(60) * RUIDO
+        fixos = sorted({n - 1 for n in fixos})
+        escolhidos = list(fixos)
+        while len(escolhidos) < quantidade:
+            escolhidos.append(int(np.argmin(self._custo_candidatos(escolhidos, ruido))))
+
+        for _ in range(MAX_PASSOS_BUSCA):
+            melhorou = False
+            for indice in range(len(fixos), len(escolhidos)):
+                restantes = escolhidos[:indice] + escolhidos[indice + 1:]
+                custo = self._custo_candidatos(restantes, ruido)
+                melhor = int(np.argmin(custo))
+                if custo[melhor] < custo[escolhidos[indice]] - 1e-9:
+                    escolhidos[indice] = melhor
+                    melhorou = True
+            if not melhorou:
+                break
+        return sorted(n + 1 for n in escolhidos)